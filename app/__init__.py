@@ -2,18 +2,49 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import Config
+from app.routing import RoutingSession
 
 # Initialize SQLAlchemy and Migrate
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = None
 
 
-def create_app():
+def create_app(config=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config)
 
     db.init_app(app)
 
+    # Invalidate version-keyed caches whenever the catalog changes
+    from app import cache
+
+    cache.init_app(db)
+
+    # Route GET requests to the read engine, if one is configured
+    from app import routing
+
+    routing.init_app(app, db)
+
+    # Limit concurrent requests per endpoint class so imports can't starve reads
+    from app import admission
+
+    admission.init_app(app)
+
+    # Optionally coalesce small concurrent writes into group commits
+    from app import write_queue
+
+    write_queue.init_app(app)
+
+    # Perceptual hash index for similar-image search
+    from app import image_index
+
+    image_index.init_app(app)
+
+    # `flask storage` commands for storage analysis and compaction
+    from app import storage
+
+    storage.init_app(app)
+
     # Initialize Migration
     global migrate
     migrate = Migrate(app, db)
@@ -24,11 +55,28 @@ def create_app():
         coating_blueprint,
         shape_blueprint,
         material_blueprint,
+        metrics_blueprint,
+        upload_blueprint,
+        catalog_blueprint,
+        changes_blueprint,
+        image_blueprint,
+        admin_blueprint,
     )
 
     app.register_blueprint(user_blueprint, url_prefix="/api/users")
     app.register_blueprint(coating_blueprint, url_prefix="/api/coatings")
     app.register_blueprint(shape_blueprint, url_prefix="/api/shapes")
     app.register_blueprint(material_blueprint, url_prefix="/api/materials")
+    app.register_blueprint(metrics_blueprint, url_prefix="/api/metrics")
+    app.register_blueprint(upload_blueprint, url_prefix="/api/uploads")
+    app.register_blueprint(catalog_blueprint, url_prefix="/api/catalog")
+    app.register_blueprint(changes_blueprint, url_prefix="/api/changes")
+    app.register_blueprint(image_blueprint, url_prefix="/api/images")
+    app.register_blueprint(admin_blueprint, url_prefix="/api/admin")
+
+    # Keep a precomputed catalog snapshot for frontend bootstrap
+    from app import snapshot
+
+    snapshot.init_app(app)
 
     return app
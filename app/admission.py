@@ -0,0 +1,159 @@
+import math
+import threading
+from flask import current_app, g, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def admission_class(name):
+    """
+    Put a view in a named admission class instead of the default read/write
+    class picked from the request method
+    """
+
+    def decorator(view):
+        view.admission_class = name
+        return view
+
+    return decorator
+
+
+class AdmissionGate:
+    """
+    Concurrency limit for one class of endpoints, with a bounded wait queue
+    """
+
+    def __init__(self, name, limit, queue_limit, timeout):
+        self.name = name
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def acquire(self):
+        """
+        Take a slot, waiting in the queue for at most timeout seconds.
+        Returns False if the queue is full or the wait timed out.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.queue_limit:
+                    self.rejected_queue_full += 1
+                    return False
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected_timeout += 1
+                return False
+
+        with self._lock:
+            self.active += 1
+            self.admitted += 1
+        return True
+
+    def release(self):
+        """
+        Give back a slot taken by acquire
+        """
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+    def metrics(self):
+        """
+        Snapshot of the gate's limits, queue depth and counters
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "queue_limit": self.queue_limit,
+                "active": self.active,
+                "queue_depth": self.waiting,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+            }
+
+
+#### REQUEST HOOKS ####
+
+
+def _classify():
+    view = current_app.view_functions.get(request.endpoint)
+    name = getattr(view, "admission_class", None)
+    if name is None:
+        name = "read" if request.method in READ_METHODS else "write"
+    return name
+
+
+def _before_request():
+    gates = current_app.extensions["admission"]
+    gate = gates.get(_classify())
+    if gate is None:
+        return None
+
+    if not gate.acquire():
+        # Imported late because the blueprints import this module
+        from app.routes.responses import failure_response
+
+        response, code = failure_response("Server is busy, please retry later", 429)
+        response.status_code = code
+        response.headers["Retry-After"] = str(max(1, math.ceil(gate.timeout)))
+        return response
+
+    g.admission_gate = gate
+    return None
+
+
+def _teardown_request(exc):
+    gate = g.pop("admission_gate", None)
+    if gate is not None:
+        gate.release()
+
+
+def _request_too_large(error):
+    from app.routes.responses import failure_response
+
+    limit = current_app.config.get("MAX_CONTENT_LENGTH")
+    return failure_response(f"Request body exceeds {limit} bytes", 413)
+
+
+def init_app(app):
+    """
+    Create the per-class gates configured for app and register the hooks
+    that admit or reject each request. Bodies over MAX_CONTENT_LENGTH are
+    rejected by Werkzeug before a view runs.
+    """
+    app.register_error_handler(RequestEntityTooLarge, _request_too_large)
+
+    if not app.config.get("ADMISSION_CONTROL", True):
+        return
+
+    queue_limit = app.config.get("ADMISSION_QUEUE_LIMIT", 16)
+    timeout = app.config.get("ADMISSION_QUEUE_TIMEOUT", 5.0)
+    app.extensions["admission"] = {
+        name: AdmissionGate(name, limit, queue_limit, timeout)
+        for name, limit in app.config.get("ADMISSION_LIMITS", {}).items()
+    }
+    app.before_request(_before_request)
+    app.teardown_request(_teardown_request)
+
+
+def admission_metrics():
+    """
+    Report the state of every admission gate of the current app
+    """
+    gates = current_app.extensions.get("admission", {})
+    return {name: gate.metrics() for name, gate in gates.items()}
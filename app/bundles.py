@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import io
+import zipfile
+
+
+class ZipStream:
+    """
+    File object for zipfile that only holds the bytes not yet handed out.
+    zipfile seeks back to finish each entry's header once its data is
+    written, so the buffer is drained between entries, never inside one:
+    memory use is bounded by the largest image, not the bundle.
+    """
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._offset = 0
+
+    def write(self, data):
+        return self._buffer.write(data)
+
+    def tell(self):
+        return self._offset + self._buffer.tell()
+
+    def seek(self, position, whence=io.SEEK_SET):
+        if whence != io.SEEK_SET or position < self._offset:
+            raise io.UnsupportedOperation("can only seek within the current entry")
+        return self._offset + self._buffer.seek(position - self._offset)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """
+        Take the bytes written since the last drain
+        """
+        data = self._buffer.getvalue()
+        self._offset += len(data)
+        self._buffer = io.BytesIO()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Generate an uncompressed (ZIP_STORED) zip archive chunk by chunk from
+    (name, date_time, data) entries, one entry per chunk
+    """
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_STORED) as archive:
+        for name, date_time, data in entries:
+            archive.writestr(zipfile.ZipInfo(name, date_time), data)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def image_entries(rows):
+    """
+    Turn (id, name, updated_at, base64_data) image rows into zip entries,
+    prefixing repeated file names with the image id
+    """
+    seen = set()
+    for image_id, name, updated_at, base64_data in rows:
+        if name in seen or not name:
+            name = f"{image_id}_{name or 'image'}"
+        seen.add(name)
+        # Zip timestamps can't predate 1980
+        date_time = max(updated_at.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+        yield name, date_time, base64.b64decode(base64_data)
+
+
+def bundle_etag(rows):
+    """
+    ETag of a bundle from its (id, change_seq, phash) image rows: it changes
+    whenever an image is added, removed or replaced
+    """
+    digest = hashlib.sha1()
+    for image_id, change_seq, phash in sorted(rows, key=lambda row: row[0]):
+        digest.update(f"{image_id}:{change_seq}:{phash};".encode())
+    return digest.hexdigest()
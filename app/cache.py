@@ -0,0 +1,126 @@
+import threading
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+# Tables whose contents make up the catalog; writes to any of them invalidate
+# every version-keyed cache entry
+CATALOG_TABLES = {
+    "coating_category",
+    "coating",
+    "shape",
+    "image",
+    "material_category",
+    "material",
+}
+
+_lock = threading.Lock()
+_version = 0
+_entries = {}
+
+
+def catalog_version():
+    """
+    Get the current catalog version of this process
+    """
+    return _version
+
+
+def bump_catalog_version():
+    """
+    Advance the catalog version, invalidating every cached entry, and tell
+    the current app's listeners
+    """
+    global _version
+    with _lock:
+        _version += 1
+        version = _version
+        _entries.clear()
+    if has_app_context():
+        for listener in list(current_app.extensions.get("catalog_listeners", [])):
+            listener(version)
+
+
+def on_catalog_change(app, listener):
+    """
+    Call listener with the new version every time a commit made under app
+    changes the catalog
+    """
+    listeners = app.extensions.setdefault("catalog_listeners", [])
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def cached(key, compute):
+    """
+    Return the value cached under key for the current catalog version,
+    calling compute to (re)build it when the version has moved on.
+    """
+    version = _version
+    entry = _entries.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    value = compute()
+    with _lock:
+        if version == _version:
+            _entries[key] = (version, value)
+    return value
+
+
+#### SESSION HOOKS ####
+
+
+def _touches_catalog(instances):
+    return any(
+        getattr(instance, "__tablename__", None) in CATALOG_TABLES
+        for instance in instances
+    )
+
+
+def _before_flush(session, flush_context, instances):
+    if (
+        _touches_catalog(session.new)
+        or _touches_catalog(session.dirty)
+        or _touches_catalog(session.deleted)
+    ):
+        session.info["catalog_changed"] = True
+
+
+def _do_orm_execute(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the unit of work
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    if any(
+        mapper.local_table.name in CATALOG_TABLES
+        for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info["catalog_changed"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("catalog_changed", False):
+        bump_catalog_version()
+
+
+def _after_rollback(session):
+    session.info.pop("catalog_changed", None)
+
+
+def init_app(db):
+    """
+    Register the session hooks that keep the catalog version current.
+    The version is per process, so each worker invalidates its own caches.
+    """
+    hooks = {
+        "before_flush": _before_flush,
+        "do_orm_execute": _do_orm_execute,
+        "after_commit": _after_commit,
+        "after_rollback": _after_rollback,
+    }
+    for name, hook in hooks.items():
+        if not event.contains(db.session, name, hook):
+            event.listen(db.session, name, hook)
@@ -0,0 +1,88 @@
+from datetime import datetime
+import sqlalchemy as sa
+from sqlalchemy import event
+from app import db
+
+# Every insert, update and delete of a catalog row takes the next value of a
+# single counter in the same transaction. Holding the counter row's lock
+# until commit means changes become visible in sequence order, so a client
+# that has seen everything up to N only ever needs the changes after N.
+change_counter = sa.table(
+    "change_counter", sa.column("id", sa.Integer), sa.column("value", sa.Integer)
+)
+tombstone = sa.table(
+    "tombstone",
+    sa.column("table_name", sa.String),
+    sa.column("row_id", sa.Integer),
+    sa.column("change_seq", sa.Integer),
+    sa.column("deleted_at", sa.DateTime),
+)
+
+
+def reserve_change_seq(connection):
+    """
+    Take the next change sequence number on connection
+    """
+    value = connection.execute(
+        change_counter.update()
+        .where(change_counter.c.id == 1)
+        .values(value=change_counter.c.value + 1)
+        .returning(change_counter.c.value)
+    ).scalar()
+    if value is None:
+        connection.execute(change_counter.insert().values(id=1, value=1))
+        value = 1
+    return value
+
+
+def next_change_seq(context):
+    """
+    Column default/onupdate that stamps a row with the next sequence number
+    """
+    return reserve_change_seq(context.connection)
+
+
+def record_tombstones(connection, table_name, row_ids):
+    """
+    Record the deletion of row_ids from table_name, for deletes that bypass
+    the ORM (bulk DELETE statements)
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "table_name": table_name,
+            "row_id": row_id,
+            "change_seq": reserve_change_seq(connection),
+            "deleted_at": now,
+        }
+        for row_id in row_ids
+    ]
+    if rows:
+        connection.execute(tombstone.insert(), rows)
+
+
+class ChangeTracked:
+    """
+    Mixin for catalog models: stamps every insert and update with the time
+    and a change sequence number, and leaves a tombstone behind on delete
+    """
+
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True,
+    )
+    change_seq = db.Column(
+        db.Integer,
+        nullable=False,
+        default=next_change_seq,
+        onupdate=next_change_seq,
+        index=True,
+    )
+
+
+@event.listens_for(ChangeTracked, "after_delete", propagate=True)
+def _record_delete(mapper, connection, target):
+    record_tombstones(connection, mapper.local_table.name, [target.id])
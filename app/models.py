@@ -1,4 +1,6 @@
 from app import db
+from app.changes import ChangeTracked
+from app.thickness import parse_thickness
 
 
 class User(db.Model):
@@ -26,7 +28,7 @@ class User(db.Model):
         return {"id": self.id, "username": self.username}
 
 
-class CoatingCategory(db.Model):
+class CoatingCategory(ChangeTracked, db.Model):
     """
     Coating Category Model
     """
@@ -61,7 +63,7 @@ class CoatingCategory(db.Model):
         return {"id": self.id, "name": self.name}
 
 
-class Coating(db.Model):
+class Coating(ChangeTracked, db.Model):
     """
     Coating Model
     """
@@ -70,6 +72,8 @@ class Coating(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     sub_category = db.Column(db.String, nullable=False)
     thickness = db.Column(db.String, nullable=False)
+    thickness_min_um = db.Column(db.Float, index=True)
+    thickness_max_um = db.Column(db.Float, index=True)
     color = db.Column(db.String, nullable=False)
     category_id = db.Column(
         db.Integer, db.ForeignKey("coating_category.id"), nullable=False
@@ -84,6 +88,14 @@ class Coating(db.Model):
         self.color = kwargs.get("color", "")
         self.category_id = kwargs.get("category_id", -1)
 
+        if "thickness_min_um" in kwargs or "thickness_max_um" in kwargs:
+            self.thickness_min_um = kwargs.get("thickness_min_um")
+            self.thickness_max_um = kwargs.get("thickness_max_um")
+        else:
+            self.thickness_min_um, self.thickness_max_um = parse_thickness(
+                self.thickness
+            )
+
     def serialize(self):
         """
         Serialize a coating object
@@ -93,11 +105,13 @@ class Coating(db.Model):
             "main_category": CoatingCategory.query.get(self.category_id).name,
             "sub_category": self.sub_category,
             "thickness": self.thickness,
+            "thickness_min_um": self.thickness_min_um,
+            "thickness_max_um": self.thickness_max_um,
             "color": self.color,
         }
 
 
-class Shape(db.Model):
+class Shape(ChangeTracked, db.Model):
     """
     Shape Model
     """
@@ -130,7 +144,7 @@ class Shape(db.Model):
         return {"id": self.id, "name": self.name}
 
 
-class Image(db.Model):
+class Image(ChangeTracked, db.Model):
     """
     Image Model
     """
@@ -143,12 +157,15 @@ class Image(db.Model):
     category_id = db.Column(
         db.Integer, db.ForeignKey("coating_category.id"), nullable=False
     )
+    # 64-bit perceptual hash, stored signed; None if the image can't be decoded
+    phash = db.Column(db.BigInteger)
 
     def __init__(self, **kwargs):
         """
         Initialize an image object
         """
         self.base64_data = kwargs.get("base64_data", "")
+        self.phash = kwargs.get("phash")
         self.name = kwargs.get("name", "")
         self.shape_id = kwargs.get("shape_id", -1)
         self.category_id = kwargs.get("category_id", -1)
@@ -160,7 +177,7 @@ class Image(db.Model):
         return {"id": self.id, "base64_data": self.base64_data}
 
 
-class MaterialCategory(db.Model):
+class MaterialCategory(ChangeTracked, db.Model):
     """
     Material Category Model
     """
@@ -196,7 +213,7 @@ class MaterialCategory(db.Model):
         return {"id": self.id, "name": self.name, "is_rare_earth": self.is_rare_earth}
 
 
-class Material(db.Model):
+class Material(ChangeTracked, db.Model):
     """
     Material Model
     """
@@ -238,3 +255,38 @@ class Material(db.Model):
         Serialize a material object
         """
         return {"id": self.id, "grade": self.grade}
+
+
+class ChangeCounter(db.Model):
+    """
+    Change Counter Model, a single row holding the last change sequence number
+    """
+
+    __tablename__ = "change_counter"
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False)
+
+
+class Tombstone(db.Model):
+    """
+    Tombstone Model, recording the deletion of a catalog row
+    """
+
+    __tablename__ = "tombstone"
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    table_name = db.Column(db.String, nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    change_seq = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=False)
+
+    def serialize(self):
+        """
+        Serialize a tombstone object
+        """
+        return {
+            "seq": self.change_seq,
+            "table": self.table_name,
+            "op": "delete",
+            "id": self.row_id,
+            "deleted_at": self.deleted_at.isoformat(),
+        }
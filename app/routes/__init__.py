@@ -0,0 +1,12 @@
+# One module per blueprint; the ingestion helpers in app.routes.imports load
+# pandas only when an import actually runs
+from app.routes.admin import admin_blueprint
+from app.routes.catalog import catalog_blueprint
+from app.routes.changes import changes_blueprint
+from app.routes.coating import coating_blueprint
+from app.routes.image import image_blueprint
+from app.routes.material import material_blueprint
+from app.routes.metrics import metrics_blueprint
+from app.routes.shape import shape_blueprint
+from app.routes.upload import upload_blueprint
+from app.routes.user import user_blueprint
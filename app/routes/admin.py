@@ -0,0 +1,61 @@
+import hmac
+from flask import request, Blueprint, current_app
+from app.admission import admission_class
+from app.routes.responses import failure_response, success_response
+from app.storage import (
+    ORPHAN_BATCH_SIZE,
+    PAUSE_SECONDS,
+    VACUUM_PAGES,
+    compact,
+    storage_report,
+)
+
+admin_blueprint = Blueprint("admin_blueprint", __name__)
+
+
+@admin_blueprint.before_request
+def require_admin_token():
+    """
+    Only let requests through with the configured X-Admin-Token
+    """
+    token = current_app.config.get("ADMIN_TOKEN")
+    if not token:
+        return failure_response("Admin endpoints are disabled", 403)
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return failure_response("Invalid admin token", 403)
+
+
+@admin_blueprint.route("/storage", methods=["GET"])
+def get_storage_report():
+    """
+    Get row counts and sizes per table, orphaned images and duplicate rows
+    """
+    return success_response(storage_report())
+
+
+@admin_blueprint.route("/storage/compact", methods=["POST"])
+@admission_class("import")
+def compact_storage():
+    """
+    Delete orphaned images in batches, ANALYZE and incrementally vacuum
+    """
+    data = request.get_json(silent=True) or {}
+    options = {
+        "batch_size": data.get("batch_size", ORPHAN_BATCH_SIZE),
+        "vacuum_pages": data.get("vacuum_pages", VACUUM_PAGES),
+        "pause_ms": data.get("pause_ms", PAUSE_SECONDS * 1000),
+    }
+    for name, value in options.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            return failure_response(f"{name} must be a non-negative number", 400)
+    if options["batch_size"] < 1 or options["vacuum_pages"] < 1:
+        return failure_response("batch_size and vacuum_pages must be at least 1", 400)
+
+    result = compact(
+        orphans=bool(data.get("orphans", True)),
+        batch_size=int(options["batch_size"]),
+        vacuum_pages=int(options["vacuum_pages"]),
+        pause=options["pause_ms"] / 1000,
+        enable_incremental=bool(data.get("enable_incremental", False)),
+    )
+    return success_response(result)
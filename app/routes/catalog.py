@@ -0,0 +1,38 @@
+import gzip
+from flask import request, Blueprint, current_app, make_response
+from app.routes.responses import success_response
+
+catalog_blueprint = Blueprint("catalog_blueprint", __name__)
+
+
+@catalog_blueprint.route("/snapshot", methods=["GET"])
+def get_catalog_snapshot():
+    """
+    Get the whole non-image catalog as one document, gzip-encoded when the
+    client accepts it
+    """
+    snapshot = current_app.extensions["catalog_snapshot"].get()
+    if snapshot["etag"] in request.if_none_match:
+        response = make_response("", 304)
+    elif "gzip" in request.accept_encodings:
+        response = make_response(snapshot["body"])
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = make_response(gzip.decompress(snapshot["body"]))
+
+    response.content_type = "application/json"
+    response.set_etag(snapshot["etag"])
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@catalog_blueprint.route("/version", methods=["GET"])
+def get_catalog_version():
+    """
+    Get the ETag of the current catalog snapshot without its body
+    """
+    snapshot = current_app.extensions["catalog_snapshot"].get()
+    return success_response(
+        {"etag": snapshot["etag"], "generated_at": snapshot["generated_at"]}
+    )
@@ -0,0 +1,101 @@
+from datetime import datetime
+from flask import request, Blueprint
+from sqlalchemy.orm import defer
+from app import db
+from app.models import (
+    ChangeCounter,
+    Coating,
+    CoatingCategory,
+    Image,
+    Material,
+    MaterialCategory,
+    Shape,
+    Tombstone,
+)
+from app.routes.helpers import MAX_BATCH_SIZE
+from app.routes.responses import failure_response, success_response
+
+changes_blueprint = Blueprint("changes_blueprint", __name__)
+
+
+# Models whose changes are published by GET /api/changes
+SYNC_MODELS = [CoatingCategory, Coating, Shape, Image, MaterialCategory, Material]
+
+# Columns too large to repeat in every change; clients fetch image bytes with
+# GET /api/images/batch?ids=... when an image's change comes through
+SYNC_EXCLUDED_COLUMNS = {Image: ["base64_data"]}
+
+
+def sync_serialize(obj):
+    """
+    Serialize every column of a catalog row for delta sync, except the ones
+    in SYNC_EXCLUDED_COLUMNS
+    """
+    excluded = SYNC_EXCLUDED_COLUMNS.get(type(obj), [])
+    row = {}
+    for column in obj.__mapper__.column_attrs:
+        if column.key in excluded:
+            continue
+        value = getattr(obj, column.key)
+        row[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+
+@changes_blueprint.route("/", methods=["GET"])
+def get_changes():
+    """
+    Get the catalog inserts, updates and deletes after change sequence
+    number since, oldest first. Resume from next_since while has_more is set.
+    """
+    since = request.args.get("since", 0, type=int)
+    limit = request.args.get("limit", 500, type=int)
+    if since < 0:
+        return failure_response("since must not be negative", 400)
+    if limit < 1 or limit > MAX_BATCH_SIZE:
+        return failure_response(f"limit must be between 1 and {MAX_BATCH_SIZE}", 400)
+
+    # Each table contributes at most limit + 1 changes, so merging them and
+    # cutting at limit tells us whether anything is left for the next page
+    changes = []
+    for model in SYNC_MODELS:
+        rows = (
+            model.query.options(
+                *[
+                    defer(getattr(model, key))
+                    for key in SYNC_EXCLUDED_COLUMNS.get(model, [])
+                ]
+            )
+            .filter(model.change_seq > since)
+            .order_by(model.change_seq)
+            .limit(limit + 1)
+        )
+        changes.extend(
+            {
+                "seq": row.change_seq,
+                "table": model.__tablename__,
+                "op": "upsert",
+                "id": row.id,
+                "data": sync_serialize(row),
+            }
+            for row in rows
+        )
+    tombstones = (
+        Tombstone.query.filter(Tombstone.change_seq > since)
+        .order_by(Tombstone.change_seq)
+        .limit(limit + 1)
+    )
+    changes.extend(tombstone.serialize() for tombstone in tombstones)
+
+    changes.sort(key=lambda change: change["seq"])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    current = db.session.query(ChangeCounter.value).filter_by(id=1).scalar()
+    return success_response(
+        {
+            "changes": changes,
+            "next_since": changes[-1]["seq"] if changes else since,
+            "has_more": has_more,
+            "current_seq": current or 0,
+        }
+    )
@@ -0,0 +1,362 @@
+import os
+from flask import request, Blueprint
+from werkzeug.utils import secure_filename
+from app import db
+from app.admission import admission_class
+from app.cache import cached
+from app.models import Coating, CoatingCategory, Image
+from app.routes.helpers import (
+    MAX_BATCH_SIZE,
+    batch_create,
+    batch_get,
+    get_batch_items,
+    image_bundle_response,
+    is_dry_run,
+    validate_batch,
+)
+from app.routes.imports import (
+    UNREADABLE_SHEET,
+    import_coating_categories_zip,
+    read_excel,
+)
+from app.routes.responses import (
+    failure_response,
+    rows_response,
+    sheet_error_response,
+    success_response,
+)
+from app.thickness import parse_thickness_series
+from app.validation import COATING_SHEET, SheetValidationError, validate_sheet
+from app.write_queue import commit_write
+
+coating_blueprint = Blueprint("coating_blueprint", __name__)
+coating_blueprint.register_error_handler(SheetValidationError, sheet_error_response)
+
+
+def value_counts(column):
+    """
+    Count coatings per distinct value of a column in a single GROUP BY query
+    """
+    rows = (
+        db.session.query(column, db.func.count(Coating.id))
+        .group_by(column)
+        .order_by(db.func.count(Coating.id).desc(), column)
+        .all()
+    )
+    return [{"value": value, "count": count} for value, count in rows]
+
+
+def compute_coating_facets():
+    """
+    Compute coating counts per category, color and thickness
+    """
+    categories = (
+        db.session.query(
+            CoatingCategory.id, CoatingCategory.name, db.func.count(Coating.id)
+        )
+        .outerjoin(Coating, Coating.category_id == CoatingCategory.id)
+        .group_by(CoatingCategory.id, CoatingCategory.name)
+        .order_by(CoatingCategory.name)
+        .all()
+    )
+    return {
+        "total": db.session.query(db.func.count(Coating.id)).scalar(),
+        "category": [
+            {"id": id, "name": name, "count": count} for id, name, count in categories
+        ],
+        "color": value_counts(Coating.color),
+        "thickness": value_counts(Coating.thickness),
+    }
+
+
+@coating_blueprint.route("/categories", methods=["GET"])
+def get_all_coating_categories():
+    """
+    Get all coating categories
+    """
+    return rows_response(
+        db.session.query(CoatingCategory.id, CoatingCategory.name), ["id", "name"]
+    )
+
+
+@coating_blueprint.route("/categories", methods=["POST"])
+def create_coating_category():
+    """
+    Create a new coating category
+    """
+    data = request.json
+    name = data.get("name")
+
+    if not name:
+        return failure_response("Missing name", 400)
+
+    def operation():
+        new_category = CoatingCategory(name=name)
+        db.session.add(new_category)
+        db.session.flush()
+        return new_category.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@coating_blueprint.route("/categories/batch", methods=["POST"])
+def create_coating_categories():
+    """
+    Create many coating categories in one transaction
+    """
+    items = get_batch_items()
+    if items is None:
+        return failure_response(
+            f"Body must be an array of 1 to {MAX_BATCH_SIZE} items", 400
+        )
+
+    errors = validate_batch(
+        items, ["name"], string=["name"], unique=("name", CoatingCategory.name)
+    )
+    if errors:
+        return failure_response("Invalid items", 400, items=errors)
+
+    rows = [{"name": item["name"]} for item in items]
+    return batch_create(CoatingCategory, rows, CoatingCategory.simple_serialize)
+
+
+@coating_blueprint.route("/categories/<int:category_id>", methods=["GET"])
+def get_coating_category(category_id):
+    """
+    Get a coating category by ID
+    """
+    category = CoatingCategory.query.get(category_id)
+    if category:
+        return success_response(category.serialize())
+    return failure_response("Category not found", 404)
+
+
+@coating_blueprint.route("/categories/<int:category_id>/images.zip", methods=["GET"])
+def get_coating_category_images_zip(category_id):
+    """
+    Download every image of a coating category as one zip, streamed as it is
+    built
+    """
+    category = CoatingCategory.query.get(category_id)
+    if category is None:
+        return failure_response("Category not found", 404)
+
+    filename = f"{secure_filename(category.name) or category_id}-images.zip"
+    return image_bundle_response(Image.category_id == category_id, filename)
+
+
+@coating_blueprint.route("/facets", methods=["GET"])
+def get_coating_facets():
+    """
+    Get coating counts grouped by category, color and thickness
+    """
+    return success_response(cached("coating_facets", compute_coating_facets))
+
+
+# Coating.serialize() fields, in the order get_all_coatings selects them
+COATING_COLUMNS = [
+    "id",
+    "main_category",
+    "sub_category",
+    "thickness",
+    "thickness_min_um",
+    "thickness_max_um",
+    "color",
+]
+
+
+@coating_blueprint.route("/", methods=["GET"])
+def get_all_coatings():
+    """
+    Get all coatings, optionally filtered to those whose thickness range
+    overlaps [min_thickness, max_thickness] (in µm) and sorted by thickness
+    """
+    min_thickness = request.args.get("min_thickness", type=float)
+    max_thickness = request.args.get("max_thickness", type=float)
+    sort = request.args.get("sort")
+
+    query = db.session.query(
+        Coating.id,
+        CoatingCategory.name,
+        Coating.sub_category,
+        Coating.thickness,
+        Coating.thickness_min_um,
+        Coating.thickness_max_um,
+        Coating.color,
+    ).outerjoin(CoatingCategory, Coating.category_id == CoatingCategory.id)
+    if min_thickness is not None:
+        query = query.filter(Coating.thickness_max_um >= min_thickness)
+    if max_thickness is not None:
+        query = query.filter(Coating.thickness_min_um <= max_thickness)
+
+    if sort in ("thickness", "-thickness"):
+        order = [Coating.thickness_min_um, Coating.thickness_max_um]
+        if sort == "-thickness":
+            order = [column.desc() for column in order]
+        # Coatings without a parsable thickness always sort last
+        query = query.order_by(Coating.thickness_min_um.is_(None), *order)
+    elif sort is not None:
+        return failure_response("sort must be thickness or -thickness", 400)
+
+    return rows_response(query, COATING_COLUMNS)
+
+
+@coating_blueprint.route("/<int:coating_id>", methods=["GET"])
+def get_coating(coating_id):
+    """
+    Get a coating by ID
+    """
+    coating = Coating.query.get(coating_id)
+    if coating:
+        return success_response(coating.serialize())
+    return failure_response("Coating not found", 404)
+
+
+@coating_blueprint.route("/", methods=["POST"])
+def create_coating():
+    """
+    Create a new coating
+    """
+    data = request.json
+    name = data.get("name")
+    sub_category = data.get("sub_category")
+    thickness = data.get("thickness")
+    color = data.get("color")
+
+    if not name or not sub_category or not thickness or not color:
+        return failure_response("Missing required fields", 400)
+
+    def operation():
+        new_coating = Coating(
+            name=name, sub_category=sub_category, thickness=thickness, color=color
+        )
+        db.session.add(new_coating)
+        db.session.flush()
+        return new_coating.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@coating_blueprint.route("/batch", methods=["POST"])
+def create_coatings():
+    """
+    Create many coatings in one transaction
+    """
+    items = get_batch_items()
+    if items is None:
+        return failure_response(
+            f"Body must be an array of 1 to {MAX_BATCH_SIZE} items", 400
+        )
+
+    errors = validate_batch(
+        items,
+        ["sub_category", "thickness", "color", "category_id"],
+        string=["sub_category", "thickness", "color"],
+        reference=("category_id", CoatingCategory.id),
+    )
+    if errors:
+        return failure_response("Invalid items", 400, items=errors)
+
+    thickness = parse_thickness_series([item["thickness"] for item in items])
+    thickness = thickness.astype(object).where(thickness.notna(), None)
+    rows = [
+        {
+            "sub_category": item["sub_category"],
+            "thickness": item["thickness"],
+            "thickness_min_um": min_um,
+            "thickness_max_um": max_um,
+            "color": item["color"],
+            "category_id": item["category_id"],
+        }
+        for item, min_um, max_um in zip(
+            items, thickness["thickness_min_um"], thickness["thickness_max_um"]
+        )
+    ]
+    return batch_create(Coating, rows, Coating.serialize)
+
+
+@coating_blueprint.route("/batch", methods=["GET"])
+def get_coatings():
+    """
+    Get many coatings by ID
+    """
+    return batch_get(Coating, "Coating")
+
+
+@coating_blueprint.route("/upload_excel", methods=["POST"])
+@admission_class("import")
+def upload_coatings():
+    """
+    Import a coatings spreadsheet, all or nothing once the whole sheet passes
+    validation. With ?dry_run=1 only the validation report is returned.
+    """
+    if "file" not in request.files:
+        return failure_response("No file part in the request", 400)
+
+    file = request.files["file"]
+    file_extension = os.path.splitext(file.filename)[1]
+
+    engines = {".xls": "xlrd", ".xlsx": "openpyxl"}
+    if file_extension.lower() not in engines:
+        return failure_response("Invalid file format", 400)
+    try:
+        df = read_excel(file, engine=engines[file_extension.lower()])
+    except Exception:
+        raise SheetValidationError([UNREADABLE_SHEET])
+
+    # Validate the whole sheet before any database work
+    errors = validate_sheet(df, COATING_SHEET)
+    if is_dry_run():
+        return success_response(
+            {"dry_run": True, "rows": len(df), "valid": not errors, "errors": errors}
+        )
+    if errors:
+        raise SheetValidationError(errors)
+
+    # Parse every thickness string up front, storing unparsable ones as NULL
+    thickness = parse_thickness_series(df["thickness"]).astype(object)
+    df = df.join(thickness.where(thickness.notna(), None))
+
+    categories = {}
+    for index, row in df.iterrows():
+        # Check and create CoatingCategory if needed
+        category_name = row["category"]
+        category = categories.get(category_name)
+        if category is None:
+            category = CoatingCategory.query.filter_by(name=category_name).first()
+        if not category:
+            category = CoatingCategory(name=category_name)
+            db.session.add(category)
+            db.session.flush()  # To get the category_id before committing
+        categories[category_name] = category
+
+        # Create a new Coating
+        new_coating = Coating(
+            sub_category=row["subcategory"],
+            thickness=row["thickness"],
+            thickness_min_um=row["thickness_min_um"],
+            thickness_max_um=row["thickness_max_um"],
+            color=row["color"],
+            category_id=category.id,
+        )
+        db.session.add(new_coating)
+
+    db.session.commit()
+    return success_response({"message": "Coatings uploaded successfully"}, 201)
+
+
+@coating_blueprint.route("/categories/upload_zip", methods=["POST"])
+@admission_class("import")
+def upload_coating_categories_from_zip():
+    if "file" not in request.files:
+        return failure_response("No file part in the request", 400)
+
+    zip_file = request.files["file"]
+    if not zip_file.filename.endswith(".zip"):
+        return failure_response("The file must be a zip", 400)
+
+    import_coating_categories_zip(zip_file.stream)
+
+    return success_response(
+        {"message": "Coating categories and images uploaded successfully"}, 201
+    )
@@ -0,0 +1,189 @@
+from flask import request, current_app, make_response, stream_with_context
+from sqlalchemy import insert
+from app import db
+from app.bundles import bundle_etag, image_entries, stream_zip
+from app.models import Image
+from app.routes.responses import failure_response, success_response
+
+MAX_BATCH_SIZE = 1000
+
+
+def get_batch_items():
+    """
+    Get the items of a batch create request, or None if the body is not a
+    non-empty JSON array within MAX_BATCH_SIZE
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items or len(items) > MAX_BATCH_SIZE:
+        return None
+    return items
+
+
+# Images whose data is fetched from the database at a time while streaming
+BUNDLE_BATCH_SIZE = 20
+
+
+def _bundle_rows(images):
+    """
+    Yield the (id, name, updated_at, base64_data) rows of images, a list of
+    rows loaded up front, fetching the data a batch at a time. An image
+    replaced or deleted since is left out rather than sent newer than the
+    ETag, which has already moved on for the next request.
+    """
+    for start in range(0, len(images), BUNDLE_BATCH_SIZE):
+        batch = images[start : start + BUNDLE_BATCH_SIZE]
+        data = {
+            image_id: (change_seq, base64_data)
+            for image_id, change_seq, base64_data in db.session.query(
+                Image.id, Image.change_seq, Image.base64_data
+            ).filter(Image.id.in_([image.id for image in batch]))
+        }
+        for image in batch:
+            change_seq, base64_data = data.get(image.id, (None, None))
+            if change_seq == image.change_seq:
+                yield image.id, image.name, image.updated_at, base64_data
+
+
+def image_bundle_response(condition, filename):
+    """
+    Stream every image matching condition as a zip built on the fly, or
+    answer 304 if the client's ETag still matches the set of images. The
+    ETag and the zip entries come from the same query, so they always agree.
+    """
+    images = (
+        db.session.query(
+            Image.id, Image.name, Image.updated_at, Image.change_seq, Image.phash
+        )
+        .filter(condition)
+        .order_by(Image.id)
+        .all()
+    )
+    etag = bundle_etag((image.id, image.change_seq, image.phash) for image in images)
+    if etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = current_app.response_class(
+            stream_with_context(stream_zip(image_entries(_bundle_rows(images)))),
+            mimetype="application/zip",
+        )
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def is_dry_run():
+    """
+    Whether the request asks to validate only, with ?dry_run=1 or true
+    """
+    return request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_batch(
+    items, required, numeric=(), string=(), boolean=(), unique=None, reference=None
+):
+    """
+    Validate a whole batch before any write: required fields and the JSON
+    type of numeric, string and boolean fields per item (reference fields
+    must be integers), then a unique (field, column) pair within the batch
+    and the table, and a foreign key (field, column) pair, each with a
+    single IN query. Returns a list of per-item errors, empty if the batch
+    is valid.
+    """
+    checks = [
+        (numeric, is_number, "numeric"),
+        (string, lambda value: isinstance(value, str), "a string"),
+        (boolean, lambda value: isinstance(value, bool), "a boolean"),
+        (reference[:1] if reference else (), is_integer, "an integer"),
+    ]
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[index] = "Item must be an object"
+            continue
+        missing = [field for field in required if item.get(field) is None]
+        if missing:
+            errors[index] = f"Missing {', '.join(missing)}"
+            continue
+        for fields, check, kind in checks:
+            invalid = [field for field in fields if not check(item[field])]
+            if invalid:
+                errors[index] = f"{', '.join(invalid)} must be {kind}"
+                break
+
+    valid = [(index, item) for index, item in enumerate(items) if index not in errors]
+
+    if unique is not None and valid:
+        field, column = unique
+        values = {item[field] for _, item in valid}
+        existing = {
+            value for (value,) in db.session.query(column).filter(column.in_(values))
+        }
+        seen = set()
+        for index, item in valid:
+            if item[field] in existing or item[field] in seen:
+                errors[index] = f"Duplicate {field} {item[field]!r}"
+            seen.add(item[field])
+
+    if reference is not None and valid:
+        field, column = reference
+        values = {item[field] for _, item in valid}
+        existing = {
+            value for (value,) in db.session.query(column).filter(column.in_(values))
+        }
+        for index, item in valid:
+            if item[field] not in existing:
+                errors.setdefault(index, f"{field} {item[field]!r} does not exist")
+
+    return [{"index": index, "error": error} for index, error in sorted(errors.items())]
+
+
+def batch_create(model, rows, serialize):
+    """
+    Insert every row with one bulk INSERT ... RETURNING in a single
+    transaction, and respond with a result per item
+    """
+    objects = db.session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True), rows
+    ).all()
+    results = [
+        {"index": index, "status": 201, "data": serialize(obj)}
+        for index, obj in enumerate(objects)
+    ]
+    db.session.commit()
+    return success_response(results, 201)
+
+
+def batch_get(model, name, options=()):
+    """
+    Fetch every id in the ids query parameter with a single IN query, and
+    respond with a result per id in the requested order
+    """
+    try:
+        ids = [int(id) for id in request.args.get("ids", "").split(",") if id.strip()]
+    except ValueError:
+        return failure_response("ids must be a comma-separated list of integers", 400)
+    if not ids or len(ids) > MAX_BATCH_SIZE:
+        return failure_response(f"ids must list 1 to {MAX_BATCH_SIZE} ids", 400)
+
+    found = {
+        obj.id: obj for obj in model.query.options(*options).filter(model.id.in_(ids))
+    }
+    results = [
+        (
+            {"id": id, "status": 200, "data": found[id].serialize()}
+            if id in found
+            else {"id": id, "status": 404, "error": f"{name} not found"}
+        )
+        for id in ids
+    ]
+    return success_response(results)
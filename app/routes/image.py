@@ -0,0 +1,85 @@
+from flask import request, Blueprint
+from app import db
+from app.admission import admission_class
+from app.image_index import compute_phash, similar_images
+from app.models import CoatingCategory, Image, Shape
+from app.routes.helpers import batch_get
+from app.routes.responses import failure_response, success_response
+
+image_blueprint = Blueprint("image_blueprint", __name__)
+
+
+MAX_SIMILAR_IMAGES = 100
+
+
+@image_blueprint.route("/batch", methods=["GET"])
+def get_images():
+    """
+    Get many images with their data by ID
+    """
+    return batch_get(Image, "Image")
+
+
+@image_blueprint.route("/similar", methods=["POST"])
+@admission_class("read")
+def find_similar_images():
+    """
+    Find the library images that look most like an uploaded photo, by
+    perceptual hash distance, with the shape or coating category of each
+    """
+    if "file" not in request.files:
+        return failure_response("No file part", 400)
+    file = request.files["file"]
+    if file.filename == "":
+        return failure_response("No selected file", 400)
+
+    try:
+        k = int(request.form.get("k", 10))
+        max_distance = request.form.get("max_distance")
+        max_distance = int(max_distance) if max_distance is not None else None
+    except ValueError:
+        return failure_response("k and max_distance must be integers", 400)
+    if not 1 <= k <= MAX_SIMILAR_IMAGES:
+        return failure_response(f"k must be between 1 and {MAX_SIMILAR_IMAGES}", 400)
+
+    phash = compute_phash(file.read())
+    if phash is None:
+        return failure_response("Could not read the uploaded image", 400)
+
+    matches = similar_images(phash, k, max_distance)
+    names = dict(
+        db.session.query(Image.id, Image.name).filter(
+            Image.id.in_([match[0] for match in matches])
+        )
+    )
+    shapes = dict(
+        db.session.query(Shape.id, Shape.name).filter(
+            Shape.id.in_({match[2] for match in matches})
+        )
+    )
+    categories = dict(
+        db.session.query(CoatingCategory.id, CoatingCategory.name).filter(
+            CoatingCategory.id.in_({match[3] for match in matches})
+        )
+    )
+
+    results = []
+    for image_id, distance, shape_id, category_id in matches:
+        results.append(
+            {
+                "image_id": image_id,
+                "name": names.get(image_id),
+                "distance": distance,
+                "shape": (
+                    {"id": shape_id, "name": shapes[shape_id]}
+                    if shape_id in shapes
+                    else None
+                ),
+                "category": (
+                    {"id": category_id, "name": categories[category_id]}
+                    if category_id in categories
+                    else None
+                ),
+            }
+        )
+    return success_response({"phash": f"{phash:016x}", "matches": results})
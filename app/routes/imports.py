@@ -0,0 +1,225 @@
+import base64
+import os
+import shutil
+import tempfile
+import zipfile
+from werkzeug.utils import secure_filename
+from app import db
+from app.image_index import compute_phash, to_signed
+from app.models import CoatingCategory, Image, MaterialCategory, Material, Shape
+from app.validation import MATERIAL_SHEET, SheetValidationError, validate_sheet
+
+# pandas (and through it openpyxl and xlrd) is only imported by the functions
+# that read spreadsheets, so it stays out of app startup
+
+
+def read_excel(source, engine=None):
+    """
+    Read a spreadsheet into a DataFrame with lower-cased, space-free headers
+    """
+    import pandas as pd
+
+    df = pd.read_excel(source, engine=engine)
+
+    # Standardize column headers: lower case and remove spaces
+    df.columns = df.columns.str.lower().str.replace(" ", "")
+    return df
+
+
+# Report entry for a file read_excel can't parse at all
+UNREADABLE_SHEET = {"row": None, "column": None, "error": "Could not read spreadsheet"}
+
+
+def process_excel_file(filepath):
+    return read_excel(filepath, engine="openpyxl")
+
+
+def allowed_file_excel(filename):
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in {"xlsx", "xls"}
+
+
+def extract_zip(source):
+    """
+    Extract a zip archive (a path or seekable file object) into a new
+    temporary directory, returning the directory and its first-level folder
+    """
+    temp_dir = tempfile.mkdtemp()
+    with zipfile.ZipFile(source) as z:
+        z.extractall(temp_dir)
+    first_level_directory = next(os.walk(temp_dir))[1][0]
+    return temp_dir, os.path.join(temp_dir, first_level_directory)
+
+
+def import_coating_categories_zip(source):
+    """
+    Import a zip of coating category folders, each containing images
+    """
+    temp_dir, category_dir = extract_zip(source)
+    try:
+        for category_name in os.listdir(category_dir):
+            if category_name == "__MACOSX":
+                continue
+            category_path = os.path.join(category_dir, category_name)
+            if os.path.isdir(category_path):
+                # Create a new coating category or get existing one
+                category = CoatingCategory.query.filter_by(name=category_name).first()
+                if not category:
+                    category = CoatingCategory(name=category_name)
+                    db.session.add(category)
+                    db.session.flush()  # To get the category_id before committing
+
+                # Process each image file inside the category's folder
+                for file_name in os.listdir(category_path):
+                    file_path = os.path.join(category_path, file_name)
+                    if file_name.endswith((".png", ".jpg", ".jpeg")):
+                        with open(file_path, "rb") as file:
+                            file_content = file.read()
+                            base64_data = base64.b64encode(file_content).decode("utf-8")
+
+                            # Save the image to the database
+                            new_image = Image(
+                                name=secure_filename(file_name),
+                                base64_data=base64_data,
+                                category_id=category.id,
+                                phash=to_signed(compute_phash(file_content)),
+                            )
+                            db.session.add(new_image)
+
+        db.session.commit()
+    finally:
+        # Clean up the temporary directory
+        shutil.rmtree(temp_dir)
+
+
+def import_shapes_zip(source):
+    """
+    Import a zip of shape folders, each containing images
+    """
+    temp_dir, shape_dir = extract_zip(source)
+    try:
+        for shape_name in os.listdir(shape_dir):
+            if shape_name == "__MACOSX":
+                continue
+            shape_path = os.path.join(shape_dir, shape_name)
+            if os.path.isdir(shape_path):
+                # Create a new shape for each folder
+                new_shape = Shape(name=shape_name)
+                db.session.add(new_shape)
+                db.session.flush()  # To get the shape_id before committing
+
+                # Process each image file inside the shape's folder
+                for file_name in os.listdir(shape_path):
+                    file_path = os.path.join(shape_path, file_name)
+                    if file_name.endswith((".png", ".jpg", ".jpeg")):
+                        with open(file_path, "rb") as file:
+                            file_content = file.read()
+                            base64_data = base64.b64encode(file_content).decode("utf-8")
+
+                            # Save the image to the database
+                            new_image = Image(
+                                name=secure_filename(file_name),
+                                base64_data=base64_data,
+                                shape_id=new_shape.id,
+                                phash=to_signed(compute_phash(file_content)),
+                            )
+                            db.session.add(new_image)
+
+        db.session.commit()
+    finally:
+        # Clean up the temporary directory
+        shutil.rmtree(temp_dir)
+
+
+def import_materials_zip(source, dry_run=False):
+    """
+    Import a zip of rare-earth / non-rare-earth folders of material sheets.
+    Every sheet is validated before anything is written; with dry_run the
+    validation report is returned and the database is never touched.
+    """
+    temp_dir, material_dir = extract_zip(source)
+    try:
+        sheets, errors = read_material_sheets(material_dir)
+    finally:
+        # Clean up the temporary directory
+        shutil.rmtree(temp_dir)
+
+    report = {
+        "dry_run": dry_run,
+        "sheets": len(sheets),
+        "rows": sum(len(df) for _, _, df in sheets),
+        "valid": not errors,
+        "errors": errors,
+    }
+    if dry_run:
+        return report
+    if errors:
+        raise SheetValidationError(errors)
+
+    for category_name, is_rare_earth, df in sheets:
+        process_material_sheet(category_name, is_rare_earth, df)
+    db.session.commit()
+    return report
+
+
+def read_material_sheets(material_dir):
+    """
+    Read and validate every sheet in an extracted materials zip. Returns the
+    sheets as (category name, is_rare_earth, DataFrame) tuples, and the
+    errors of all of them, each tagged with the file it came from.
+    """
+    sheets = []
+    errors = []
+    for folder_name in sorted(os.listdir(material_dir)):
+        folder_path = os.path.join(material_dir, folder_name)
+        if not os.path.isdir(folder_path):
+            continue
+        is_rare_earth = not ("Non Rare Earth" in folder_name)
+        for filename in sorted(os.listdir(folder_path)):
+            if not filename.endswith((".xlsx", ".xls")):
+                continue
+            file = f"{folder_name}/{filename}"
+            try:
+                df = read_excel(os.path.join(folder_path, filename))
+            except Exception:
+                errors.append(UNREADABLE_SHEET | {"file": file})
+                continue
+            errors.extend(
+                {"file": file, **error} for error in validate_sheet(df, MATERIAL_SHEET)
+            )
+            sheets.append((os.path.splitext(filename)[0], is_rare_earth, df))
+    return sheets, errors
+
+
+def process_material_sheet(category_name, is_rare_earth, df):
+    """
+    Add the materials of a validated sheet to its category, creating the
+    category if needed
+    """
+    category = MaterialCategory.query.filter_by(name=category_name).first()
+    if not category:
+        category = MaterialCategory(name=category_name, is_rare_earth=is_rare_earth)
+        db.session.add(category)
+        db.session.flush()  # Get the category_id before committing
+
+    for grade, br_t, hcb_kA_m, bh_max_kj_m3 in zip(
+        df["grade"], df["br_t"], df["hcb_ka/m"], df["bh_max_kj/m3"]
+    ):
+        material = Material(
+            grade=grade,
+            br_t=br_t,
+            hcb_kA_m=hcb_kA_m,
+            bh_max_kj_m3=bh_max_kj_m3,
+            category_id=category.id,
+        )
+        db.session.add(material)
+
+
+# Zip importers that a finalized chunked upload can be handed to
+ZIP_IMPORTERS = {
+    "coating_categories": (
+        import_coating_categories_zip,
+        "Coating categories and images uploaded successfully",
+    ),
+    "shapes": (import_shapes_zip, "Shapes and images uploaded successfully"),
+    "materials": (import_materials_zip, "Materials uploaded successfully"),
+}
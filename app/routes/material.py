@@ -0,0 +1,276 @@
+from flask import request, Blueprint
+from app import db
+from app.admission import admission_class
+from app.cache import cached
+from app.models import Material, MaterialCategory
+from app.routes.helpers import (
+    MAX_BATCH_SIZE,
+    batch_create,
+    batch_get,
+    get_batch_items,
+    is_dry_run,
+    validate_batch,
+)
+from app.routes.imports import import_materials_zip
+from app.routes.responses import (
+    failure_response,
+    rows_response,
+    sheet_error_response,
+    success_response,
+)
+from app.validation import SheetValidationError
+from app.write_queue import commit_write
+
+material_blueprint = Blueprint("material_blueprint", __name__)
+material_blueprint.register_error_handler(SheetValidationError, sheet_error_response)
+
+
+MATERIAL_HISTOGRAM_COLUMNS = ["br_t", "hcb_kA_m", "bh_max_kj_m3"]
+
+
+def compute_material_facets(bins):
+    """
+    Compute material counts per category and rare-earth flag, plus
+    histograms of the numeric property columns
+    """
+    import numpy as np
+
+    categories = (
+        db.session.query(
+            MaterialCategory.id,
+            MaterialCategory.name,
+            MaterialCategory.is_rare_earth,
+            db.func.count(Material.id),
+        )
+        .outerjoin(Material, Material.category_id == MaterialCategory.id)
+        .group_by(
+            MaterialCategory.id, MaterialCategory.name, MaterialCategory.is_rare_earth
+        )
+        .order_by(MaterialCategory.name)
+        .all()
+    )
+    rare_earth = (
+        db.session.query(MaterialCategory.is_rare_earth, db.func.count(Material.id))
+        .join(Material, Material.category_id == MaterialCategory.id)
+        .group_by(MaterialCategory.is_rare_earth)
+        .all()
+    )
+
+    # Load the numeric columns once and histogram them together
+    rows = db.session.query(
+        *[getattr(Material, name) for name in MATERIAL_HISTOGRAM_COLUMNS]
+    ).all()
+    values = np.array(rows, dtype=float).reshape(-1, len(MATERIAL_HISTOGRAM_COLUMNS))
+    histograms = {}
+    for i, name in enumerate(MATERIAL_HISTOGRAM_COLUMNS):
+        column = values[:, i]
+        column = column[np.isfinite(column)]
+        if column.size == 0:
+            histograms[name] = {"bins": [], "counts": []}
+            continue
+        counts, edges = np.histogram(column, bins=bins)
+        histograms[name] = {"bins": edges.tolist(), "counts": counts.tolist()}
+
+    return {
+        "total": len(rows),
+        "category": [
+            {"id": id, "name": name, "is_rare_earth": is_rare_earth, "count": count}
+            for id, name, is_rare_earth, count in categories
+        ],
+        "is_rare_earth": [
+            {"value": value, "count": count} for value, count in rare_earth
+        ],
+        "histograms": histograms,
+    }
+
+
+@material_blueprint.route("/categories", methods=["GET"])
+def get_material_categories():
+    """
+    Get all material categories
+    """
+    return rows_response(
+        db.session.query(
+            MaterialCategory.id, MaterialCategory.name, MaterialCategory.is_rare_earth
+        ),
+        ["id", "name", "is_rare_earth"],
+    )
+
+
+@material_blueprint.route("/categories", methods=["POST"])
+def create_material_category():
+    """
+    Create a new material category
+    """
+    data = request.json
+    name = data.get("name")
+    is_rare_earth = data.get("is_rare_earth")
+
+    if name is None and is_rare_earth is None:
+        return failure_response("Missing name or is_rare_earth", 400)
+
+    def operation():
+        new_category = MaterialCategory(name=name, is_rare_earth=is_rare_earth)
+        db.session.add(new_category)
+        db.session.flush()
+        return new_category.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@material_blueprint.route("/categories/batch", methods=["POST"])
+def create_material_categories():
+    """
+    Create many material categories in one transaction
+    """
+    items = get_batch_items()
+    if items is None:
+        return failure_response(
+            f"Body must be an array of 1 to {MAX_BATCH_SIZE} items", 400
+        )
+
+    errors = validate_batch(
+        items,
+        ["name", "is_rare_earth"],
+        string=["name"],
+        boolean=["is_rare_earth"],
+        unique=("name", MaterialCategory.name),
+    )
+    if errors:
+        return failure_response("Invalid items", 400, items=errors)
+
+    rows = [
+        {"name": item["name"], "is_rare_earth": item["is_rare_earth"]} for item in items
+    ]
+    return batch_create(MaterialCategory, rows, MaterialCategory.simple_serialize)
+
+
+@material_blueprint.route("/categories/<int:category_id>", methods=["GET"])
+def get_material_category(category_id):
+    """
+    Get a material category by ID
+    """
+    category = MaterialCategory.query.get(category_id)
+    if category:
+        return success_response(category.serialize())
+    return failure_response("Category not found", 404)
+
+
+@material_blueprint.route("/facets", methods=["GET"])
+def get_material_facets():
+    """
+    Get material counts grouped by category and rare-earth flag, with
+    histograms of the numeric properties
+    """
+    bins = request.args.get("bins", 10, type=int)
+    if bins < 1 or bins > 100:
+        return failure_response("bins must be between 1 and 100", 400)
+
+    return success_response(
+        cached(("material_facets", bins), lambda: compute_material_facets(bins))
+    )
+
+
+@material_blueprint.route("/", methods=["GET"])
+def get_all_materials():
+    """
+    Get all materials
+    """
+    return rows_response(db.session.query(Material.id, Material.grade), ["id", "grade"])
+
+
+@material_blueprint.route("/<int:material_id>", methods=["GET"])
+def get_material(material_id):
+    """
+    Get a material by ID
+    """
+    material = Material.query.get(material_id)
+    if material:
+        return success_response(material.serialize())
+    return failure_response("Material not found", 404)
+
+
+@material_blueprint.route("/", methods=["POST"])
+def create_material():
+    """
+    Create a new material
+    """
+    data = request.json
+    grade = data.get("grade")
+    br_t = data.get("br_t")
+    hcb_kA_m = data.get("hcb_kA_m")
+    bh_max_kj_m3 = data.get("bh_max_kj_m3")
+    category_id = data.get("category_id")
+
+    if None in [grade, br_t, hcb_kA_m, bh_max_kj_m3, category_id]:
+        return failure_response("Missing required material properties", 400)
+
+    def operation():
+        new_material = Material(
+            grade=grade,
+            br_t=br_t,
+            hcb_kA_m=hcb_kA_m,
+            bh_max_kj_m3=bh_max_kj_m3,
+            category_id=category_id,
+        )
+        db.session.add(new_material)
+        db.session.flush()
+        return new_material.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@material_blueprint.route("/batch", methods=["POST"])
+def create_materials():
+    """
+    Create many materials in one transaction
+    """
+    items = get_batch_items()
+    if items is None:
+        return failure_response(
+            f"Body must be an array of 1 to {MAX_BATCH_SIZE} items", 400
+        )
+
+    fields = ["grade", "br_t", "hcb_kA_m", "bh_max_kj_m3", "category_id"]
+    errors = validate_batch(
+        items,
+        fields,
+        numeric=["br_t", "hcb_kA_m", "bh_max_kj_m3"],
+        string=["grade"],
+        reference=("category_id", MaterialCategory.id),
+    )
+    if errors:
+        return failure_response("Invalid items", 400, items=errors)
+
+    rows = [{field: item[field] for field in fields} for item in items]
+    return batch_create(Material, rows, Material.serialize)
+
+
+@material_blueprint.route("/batch", methods=["GET"])
+def get_materials():
+    """
+    Get many materials by ID
+    """
+    return batch_get(Material, "Material")
+
+
+@material_blueprint.route("/upload_zip", methods=["POST"])
+@admission_class("import")
+def upload_materials_from_zip():
+    """
+    Import a zip of material sheets, all or nothing once every sheet passes
+    validation. With ?dry_run=1 only the validation report is returned.
+    """
+    if "file" not in request.files:
+        return failure_response("No file part in the request", 400)
+
+    zip_file = request.files["file"]
+    if not zip_file.filename.endswith(".zip"):
+        return failure_response("The file must be a zip", 400)
+
+    if is_dry_run():
+        return success_response(import_materials_zip(zip_file.stream, dry_run=True))
+
+    import_materials_zip(zip_file.stream)
+
+    return success_response({"message": "Materials uploaded successfully"}, 201)
@@ -0,0 +1,32 @@
+from flask import Blueprint
+from app import db
+from app.admission import admission_metrics
+from app.routes.responses import success_response
+from app.routing import pool_metrics
+from app.write_queue import write_queue_metrics
+
+metrics_blueprint = Blueprint("metrics_blueprint", __name__)
+
+
+@metrics_blueprint.route("/pools", methods=["GET"])
+def get_pool_metrics():
+    """
+    Get connection pool metrics for the primary and read engines
+    """
+    return success_response(pool_metrics(db))
+
+
+@metrics_blueprint.route("/admission", methods=["GET"])
+def get_admission_metrics():
+    """
+    Get concurrency, queue depth and rejection counters per endpoint class
+    """
+    return success_response(admission_metrics())
+
+
+@metrics_blueprint.route("/write_queue", methods=["GET"])
+def get_write_queue_metrics():
+    """
+    Get write queue depth and group commit counters
+    """
+    return success_response(write_queue_metrics())
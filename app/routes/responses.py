@@ -0,0 +1,90 @@
+from datetime import date, datetime
+from flask import current_app, jsonify, request
+
+RESPONSE_MIMETYPES = [
+    "application/json",
+    "application/msgpack",
+    "application/x-msgpack",
+]
+
+
+def msgpack_default(value):
+    """
+    Encode values MessagePack has no type for, as JSON responses would
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def negotiated_response(body, code):
+    """
+    Encodes a response body as JSON, or as MessagePack if the Accept header
+    prefers it and msgpack is installed.
+    :param body: The response body.
+    :param code: HTTP status code.
+    :return: Response and HTTP status code.
+    """
+    mimetype = request.accept_mimetypes.best_match(RESPONSE_MIMETYPES)
+    if mimetype in RESPONSE_MIMETYPES[1:]:
+        try:
+            import msgpack
+        except ImportError:
+            mimetype = None
+        else:
+            response = current_app.response_class(
+                msgpack.packb(body, default=msgpack_default), mimetype=mimetype
+            )
+            response.vary.add("Accept")
+            return response, code
+
+    response = jsonify(body)
+    response.vary.add("Accept")
+    return response, code
+
+
+def success_response(body, code=200):
+    """
+    Generates a success response.
+    :param body: The response body.
+    :param code: HTTP status code, default is 200.
+    :return: JSON or MessagePack response and HTTP status code.
+    """
+    return negotiated_response(body, code)
+
+
+def failure_response(message, code=404, **details):
+    """
+    Generates a failure response.
+    :param message: Error message.
+    :param code: HTTP status code, default is 404.
+    :param details: Extra fields for the response body.
+    :return: JSON or MessagePack response and HTTP status code.
+    """
+    return negotiated_response({"error": message, **details}, code)
+
+
+def sheet_error_response(error):
+    """
+    Generates a failure response carrying the per-row errors of a
+    SheetValidationError.
+    :param error: The SheetValidationError.
+    :return: JSON or MessagePack response and HTTP status code.
+    """
+    return failure_response(error.message, error.code, errors=error.errors)
+
+
+def rows_response(query, columns):
+    """
+    Generates a list response straight from the row tuples of a column query:
+    an array of objects, or with ?layout=columnar an object of arrays.
+    :param query: Query selecting one column per name in columns.
+    :param columns: Response field names.
+    :return: JSON or MessagePack response and HTTP status code.
+    """
+    rows = query.all()
+    if request.args.get("layout") == "columnar":
+        return success_response(
+            {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+        )
+    return success_response([dict(zip(columns, row)) for row in rows])
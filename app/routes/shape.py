@@ -0,0 +1,151 @@
+import base64
+from flask import request, Blueprint
+from sqlalchemy.orm import selectinload
+from werkzeug.utils import secure_filename
+from app import db
+from app.admission import admission_class
+from app.image_index import compute_phash, to_signed
+from app.models import Image, Shape
+from app.routes.helpers import (
+    MAX_BATCH_SIZE,
+    batch_create,
+    batch_get,
+    get_batch_items,
+    image_bundle_response,
+    validate_batch,
+)
+from app.routes.imports import import_shapes_zip
+from app.routes.responses import failure_response, rows_response, success_response
+from app.write_queue import commit_write
+
+shape_blueprint = Blueprint("shape_blueprint", __name__)
+
+
+@shape_blueprint.route("/", methods=["GET"])
+def get_all_shapes():
+    """
+    Get all shapes
+    """
+    return rows_response(db.session.query(Shape.id, Shape.name), ["id", "name"])
+
+
+@shape_blueprint.route("/<int:shape_id>", methods=["GET"])
+def get_shape(shape_id):
+    """
+    Get a shape by ID
+    """
+    shape = Shape.query.get(shape_id)
+    if shape:
+        return success_response(shape.serialize())
+    return failure_response("Shape not found", 404)
+
+
+@shape_blueprint.route("/", methods=["POST"])
+def create_shape():
+    """
+    Create a new shape
+    """
+    data = request.json
+    name = data.get("name")
+
+    if name == None:
+        return failure_response("Missing name", 400)
+
+    def operation():
+        new_shape = Shape(name=name)
+        db.session.add(new_shape)
+        db.session.flush()
+        return new_shape.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@shape_blueprint.route("/batch", methods=["POST"])
+def create_shapes():
+    """
+    Create many shapes in one transaction
+    """
+    items = get_batch_items()
+    if items is None:
+        return failure_response(
+            f"Body must be an array of 1 to {MAX_BATCH_SIZE} items", 400
+        )
+
+    errors = validate_batch(
+        items, ["name"], string=["name"], unique=("name", Shape.name)
+    )
+    if errors:
+        return failure_response("Invalid items", 400, items=errors)
+
+    rows = [{"name": item["name"]} for item in items]
+    return batch_create(Shape, rows, Shape.simple_serialize)
+
+
+@shape_blueprint.route("/batch", methods=["GET"])
+def get_shapes():
+    """
+    Get many shapes with their images by ID
+    """
+    return batch_get(Shape, "Shape", [selectinload(Shape.images)])
+
+
+@shape_blueprint.route("/<int:shape_id>/images", methods=["POST"])
+@admission_class("import")
+def upload_shape_image(shape_id):
+    """
+    Upload an image for a shape as a base64 string
+    """
+    shape = Shape.query.get(shape_id)
+    if shape is None:
+        return failure_response("Shape not found", 404)
+
+    if "file" not in request.files:
+        return failure_response("No file part in the request", 400)
+
+    file = request.files["file"]
+    if file.filename == "":
+        return failure_response("No selected file", 400)
+
+    # Read the file and encode it to base64
+    file_content = file.read()
+    base64_data = base64.b64encode(file_content).decode("utf-8")
+
+    # Save the image to the database
+    new_image = Image(
+        name=secure_filename(file.filename),
+        base64_data=base64_data,
+        shape_id=shape_id,
+        phash=to_signed(compute_phash(file_content)),
+    )
+    db.session.add(new_image)
+    db.session.commit()
+
+    return success_response(new_image.serialize(), 201)
+
+
+@shape_blueprint.route("/<int:shape_id>/images.zip", methods=["GET"])
+def get_shape_images_zip(shape_id):
+    """
+    Download every image of a shape as one zip, streamed as it is built
+    """
+    shape = Shape.query.get(shape_id)
+    if shape is None:
+        return failure_response("Shape not found", 404)
+
+    filename = f"{secure_filename(shape.name) or shape_id}-images.zip"
+    return image_bundle_response(Image.shape_id == shape_id, filename)
+
+
+@shape_blueprint.route("/upload_zip", methods=["POST"])
+@admission_class("import")
+def upload_shapes_from_zip():
+    if "file" not in request.files:
+        return failure_response("No file part in the request", 400)
+
+    zip_file = request.files["file"]
+    if not zip_file.filename.endswith(".zip"):
+        return failure_response("The file must be a zip", 400)
+
+    import_shapes_zip(zip_file.stream)
+
+    return success_response({"message": "Shapes and images uploaded successfully"}, 201)
@@ -0,0 +1,117 @@
+from flask import request, Blueprint, current_app
+from werkzeug.utils import secure_filename
+from app.admission import admission_class
+from app.routes.imports import ZIP_IMPORTERS
+from app.routes.responses import (
+    failure_response,
+    sheet_error_response,
+    success_response,
+)
+from app.uploads import (
+    UploadError,
+    append_chunk,
+    create_session,
+    delete_session,
+    expire_sessions,
+    finalize_session,
+    get_session,
+    release_session,
+)
+from app.validation import SheetValidationError
+
+upload_blueprint = Blueprint("upload_blueprint", __name__)
+upload_blueprint.register_error_handler(SheetValidationError, sheet_error_response)
+
+
+@upload_blueprint.errorhandler(UploadError)
+def handle_upload_error(error):
+    return failure_response(error.message, error.code)
+
+
+@upload_blueprint.route("/", methods=["POST"])
+def create_upload():
+    """
+    Start a chunked upload of a zip archive for one of the zip importers
+    """
+    data = request.json
+    filename = data.get("filename")
+    kind = data.get("kind")
+    size = data.get("size")
+
+    if not filename or not filename.endswith(".zip"):
+        return failure_response("The file must be a zip", 400)
+    if kind not in ZIP_IMPORTERS:
+        return failure_response(
+            f"kind must be one of {', '.join(sorted(ZIP_IMPORTERS))}", 400
+        )
+    if not isinstance(size, int) or size <= 0:
+        return failure_response("size must be a positive integer", 400)
+
+    expire_sessions(
+        current_app.config["UPLOAD_FOLDER"],
+        current_app.config["UPLOAD_SESSION_TTL_HOURS"] * 3600,
+    )
+    upload = create_session(
+        current_app.config["UPLOAD_FOLDER"],
+        secure_filename(filename),
+        kind,
+        size,
+        data.get("sha256"),
+    )
+    return success_response(upload, 201)
+
+
+@upload_blueprint.route("/<upload_id>", methods=["GET"])
+def get_upload(upload_id):
+    """
+    Get the state of a chunked upload, including the offset to resume from
+    """
+    return success_response(get_session(current_app.config["UPLOAD_FOLDER"], upload_id))
+
+
+@upload_blueprint.route("/<upload_id>", methods=["PUT"])
+def upload_chunk(upload_id):
+    """
+    Append the chunk in the request body, located by its Content-Range header
+    and optionally verified against an X-Chunk-SHA256 header
+    """
+    upload = append_chunk(
+        current_app.config["UPLOAD_FOLDER"],
+        upload_id,
+        request.headers.get("Content-Range"),
+        request.stream,
+        request.headers.get("X-Chunk-SHA256"),
+    )
+    return success_response(upload)
+
+
+@upload_blueprint.route("/<upload_id>/finalize", methods=["POST"])
+@admission_class("import")
+def finalize_upload(upload_id):
+    """
+    Verify a completed upload and hand the assembled archive to its importer.
+    Only the first of several finalize calls imports it; the others get 409.
+    """
+    folder = current_app.config["UPLOAD_FOLDER"]
+    upload, path = finalize_session(folder, upload_id)
+
+    importer, message = ZIP_IMPORTERS[upload["kind"]]
+    try:
+        importer(path)
+    except Exception:
+        release_session(folder, upload_id)
+        raise
+    delete_session(folder, upload_id)
+
+    return success_response({"message": message}, 201)
+
+
+@upload_blueprint.route("/<upload_id>", methods=["DELETE"])
+def delete_upload(upload_id):
+    """
+    Abort a chunked upload and discard the received chunks
+    """
+    folder = current_app.config["UPLOAD_FOLDER"]
+    get_session(folder, upload_id)
+    delete_session(folder, upload_id)
+    return success_response({"message": "Upload deleted"})
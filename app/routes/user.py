@@ -0,0 +1,36 @@
+from flask import request, Blueprint
+from app import db
+from app.models import User
+from app.routes.responses import failure_response, rows_response, success_response
+from app.write_queue import commit_write
+
+user_blueprint = Blueprint("user_blueprint", __name__)
+
+
+@user_blueprint.route("/", methods=["POST"])
+def create_user():
+    """
+    Create a new user
+    """
+    data = request.json
+    username = data.get("username")
+    password = data.get("password")
+
+    if not username or not password:
+        return failure_response("Missing username or password", 400)
+
+    def operation():
+        new_user = User(username=username, password=password)
+        db.session.add(new_user)
+        db.session.flush()
+        return new_user.serialize()
+
+    return success_response(commit_write(operation), 201)
+
+
+@user_blueprint.route("/", methods=["GET"])
+def get_users():
+    """
+    Get all users
+    """
+    return rows_response(db.session.query(User.id, User.username), ["id", "username"])
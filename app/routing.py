@@ -0,0 +1,159 @@
+import threading
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_counter_lock = threading.Lock()
+_counters = {"read": 0, "write": 0}
+
+
+def _count(role):
+    with _counter_lock:
+        _counters[role] += 1
+
+
+def use_read_engine():
+    """
+    Whether the current statement may go to the read engine: only inside a
+    read-only request that has not written anything yet (read-your-writes).
+    """
+    return (
+        has_request_context()
+        and request.method in READ_METHODS
+        and not g.get("db_wrote", False)
+    )
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads inside GET requests to the read engine and
+    everything else to the primary
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+            and use_read_engine()
+        ):
+            engine = current_app.extensions.get("read_engine")
+            if engine is not None:
+                _count("read")
+                return engine
+
+        _count("write")
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+#### SESSION HOOKS ####
+
+
+def _mark_wrote(*args):
+    if has_request_context():
+        g.db_wrote = True
+
+
+def _do_orm_execute(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        _mark_wrote()
+
+
+#### ENGINES ####
+
+
+def _enable_wal(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _set_query_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.close()
+
+
+def sqlite_read_only_url(url):
+    """
+    Turn a file-backed SQLite URL into a read-only URI connection URL
+    """
+    return url.set(
+        database="file:" + url.database, query={"mode": "ro", "uri": "true"}
+    )
+
+
+def init_app(app, db):
+    """
+    Create the read engine configured for app, if any, and register the
+    session hooks that pin a request to the primary once it writes.
+
+    SQLALCHEMY_READ_DATABASE_URI points reads at a replica. Without it,
+    SQLITE_READ_POOL opens a read-only connection pool on the primary
+    SQLite file and switches the file to WAL so readers never wait on writers.
+    """
+    for name, hook in (("after_flush", _mark_wrote), ("do_orm_execute", _do_orm_execute)):
+        if not event.contains(db.session, name, hook):
+            event.listen(db.session, name, hook)
+
+    with app.app_context():
+        primary = db.engine
+
+    read_url = app.config.get("SQLALCHEMY_READ_DATABASE_URI")
+    is_sqlite_file = primary.url.get_backend_name() == "sqlite" and primary.url.database
+    if read_url is None and is_sqlite_file and app.config.get("SQLITE_READ_POOL"):
+        event.listen(primary, "connect", _enable_wal)
+        # Switch the file to WAL now so read-only connections can attach
+        with primary.connect():
+            pass
+        read_url = sqlite_read_only_url(primary.url)
+    if read_url is None:
+        return
+
+    read_url = make_url(read_url)
+    options = {"pool_pre_ping": True}
+    if read_url.get_backend_name() == "sqlite":
+        options["pool_size"] = app.config.get("SQLITE_READ_POOL_SIZE", 5)
+    engine = create_engine(read_url, **options)
+    if read_url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _set_query_only)
+    app.extensions["read_engine"] = engine
+
+
+#### METRICS ####
+
+
+def _pool_metrics(engine):
+    pool = engine.pool
+    metrics = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "pool": type(pool).__name__,
+        "status": pool.status(),
+    }
+    # Only queue-style pools expose sizing counters
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            metrics[name] = getattr(pool, name)()
+    return metrics
+
+
+def pool_metrics(db):
+    """
+    Report connection pool state for the primary and read engines, plus how
+    many statements were routed to each
+    """
+    read_engine = current_app.extensions.get("read_engine")
+    with _counter_lock:
+        routed = dict(_counters)
+    return {
+        "primary": _pool_metrics(db.engine),
+        "read": _pool_metrics(read_engine) if read_engine is not None else None,
+        "routed": routed,
+    }
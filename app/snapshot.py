@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from sqlalchemy.orm import selectinload
+from app.cache import catalog_version, on_catalog_change
+from app.models import CoatingCategory, MaterialCategory, Shape
+
+SNAPSHOT_FILENAME = "catalog_snapshot.json.gz"
+
+
+def build_catalog_document():
+    """
+    Build the whole non-image catalog as one JSON-serializable document
+    """
+    coating_categories = (
+        CoatingCategory.query.options(selectinload(CoatingCategory.coatings))
+        .order_by(CoatingCategory.id)
+        .all()
+    )
+    material_categories = (
+        MaterialCategory.query.options(selectinload(MaterialCategory.materials))
+        .order_by(MaterialCategory.id)
+        .all()
+    )
+    shapes = Shape.query.order_by(Shape.id).all()
+
+    return {
+        "coating_categories": [
+            {
+                **category.simple_serialize(),
+                "coatings": [coating.serialize() for coating in category.coatings],
+            }
+            for category in coating_categories
+        ],
+        "material_categories": [
+            {
+                **category.simple_serialize(),
+                "materials": [material.serialize() for material in category.materials],
+            }
+            for category in material_categories
+        ],
+        "shapes": [shape.simple_serialize() for shape in shapes],
+    }
+
+
+class CatalogSnapshot:
+    """
+    Precomputed, gzip-compressed catalog document. It is first loaded on
+    the first request for it, so CLI commands never touch it, then rebuilt
+    on a background thread after every commit that changes the catalog
+    while the previous snapshot keeps being served.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.path = os.path.join(app.config["UPLOAD_FOLDER"], SNAPSHOT_FILENAME)
+        self._lock = threading.Lock()
+        # Held while the first snapshot is loaded or built, so concurrent
+        # first requests wait for one build instead of each running their own
+        self._first_lock = threading.Lock()
+        self._dirty = False
+        self._building = False
+        self.current = None
+
+    def load(self):
+        """
+        Load the snapshot persisted by a previous run, if there is one. It may
+        be out of date, so a rebuild is scheduled straight away.
+        """
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                body = file.read()
+            self.current = {
+                "version": None,
+                "etag": hashlib.sha1(body).hexdigest(),
+                "generated_at": datetime.fromtimestamp(
+                    os.path.getmtime(self.path), timezone.utc
+                ).isoformat(),
+                "body": body,
+            }
+            self.schedule()
+
+    def build(self):
+        """
+        Build a snapshot from the database and make it current
+        """
+        version = catalog_version()
+        document = json.dumps(build_catalog_document(), separators=(",", ":"))
+        body = gzip.compress(document.encode("utf-8"), mtime=0)
+        snapshot = {
+            "version": version,
+            "etag": hashlib.sha1(body).hexdigest(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "body": body,
+        }
+
+        # Write to a temporary file first so readers never see a partial file
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(body)
+
+        # A slower build of an older version must not replace a newer one
+        with self._lock:
+            current = self.current
+            if (
+                current is None
+                or current["version"] is None
+                or (version >= current["version"])
+            ):
+                os.replace(temp_path, self.path)
+                self.current = snapshot
+            else:
+                os.remove(temp_path)
+        return snapshot
+
+    def get(self):
+        """
+        Get the current snapshot. The first call loads the persisted one, or
+        builds it synchronously if there is none.
+        """
+        if self.current is None:
+            with self._first_lock:
+                if self.current is None:
+                    self.load()
+                if self.current is None:
+                    with self.app.app_context():
+                        snapshot = self.build()
+                    # Commits during the build didn't schedule a rebuild
+                    if snapshot["version"] != catalog_version():
+                        self.schedule()
+        return self.current
+
+    def schedule(self, version=None):
+        """
+        Rebuild the snapshot in the background. Changes that arrive while a
+        rebuild is running are folded into one follow-up rebuild. Nothing is
+        scheduled before the first get, which brings the snapshot up to date.
+        """
+        if self.current is None:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._building = False
+                    return
+                self._dirty = False
+            try:
+                with self.app.app_context():
+                    self.build()
+            except Exception:
+                self.app.logger.exception("Failed to rebuild catalog snapshot")
+
+
+def init_app(app):
+    """
+    Create the catalog snapshot for app and keep it current
+    """
+    snapshot = CatalogSnapshot(app)
+    on_catalog_change(app, snapshot.schedule)
+    app.extensions["catalog_snapshot"] = snapshot
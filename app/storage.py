@@ -0,0 +1,287 @@
+import json
+import time
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, inspect, text
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.changes import record_tombstones
+from app.models import CoatingCategory, Coating, Image, Material, Shape
+
+# Columns that make two rows of a table the same entry, as repeated imports
+# of the same sheet or zip produce them
+DUPLICATE_KEYS = {
+    Coating: ["category_id", "sub_category", "thickness", "color"],
+    Material: ["category_id", "grade", "br_t", "hcb_kA_m", "bh_max_kj_m3"],
+    Image: ["shape_id", "category_id", "base64_data"],
+}
+
+# Pages released per incremental vacuum step, and orphans deleted per batch
+VACUUM_PAGES = 1000
+ORPHAN_BATCH_SIZE = 500
+PAUSE_SECONDS = 0.05
+
+
+def orphan_images():
+    """
+    Images that belong to neither an existing shape nor an existing coating
+    category
+    """
+    return (
+        db.session.query(Image.id)
+        .outerjoin(Shape, Shape.id == Image.shape_id)
+        .outerjoin(CoatingCategory, CoatingCategory.id == Image.category_id)
+        .filter(Shape.id.is_(None), CoatingCategory.id.is_(None))
+    )
+
+
+def _is_sqlite():
+    return db.engine.dialect.name == "sqlite"
+
+
+def _pragma(connection, name):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def _table_bytes(connection, tables):
+    """
+    Bytes on disk per table and its indexes, from the dbstat virtual table
+    when SQLite was built with it, else the stored size of every value
+    """
+    try:
+        pages = connection.execute(
+            text(
+                "SELECT m.tbl_name, m.type, SUM(s.pgsize) FROM dbstat s "
+                "JOIN sqlite_master m ON m.name = s.name GROUP BY m.tbl_name, m.type"
+            )
+        ).all()
+    except OperationalError:
+        pages = None
+
+    if pages is not None:
+        sizes = {table: {"table_bytes": 0, "index_bytes": 0} for table in tables}
+        for table, kind, size in pages:
+            key = "index_bytes" if kind == "index" else "table_bytes"
+            sizes.setdefault(table, {"table_bytes": 0, "index_bytes": 0})[key] += size
+        return "dbstat", sizes
+
+    sizes = {}
+    for table in tables:
+        columns = [column["name"] for column in inspect(connection).get_columns(table)]
+        total = " + ".join(
+            f'COALESCE(SUM(LENGTH(CAST("{column}" AS BLOB))), 0)' for column in columns
+        )
+        size = connection.execute(text(f'SELECT {total} FROM "{table}"')).scalar()
+        sizes[table] = {"table_bytes": size, "index_bytes": None}
+    return "payload", sizes
+
+
+def duplicate_rows():
+    """
+    Count groups of rows that repeat the same DUPLICATE_KEYS, and the rows
+    beyond the first in each group
+    """
+    report = {}
+    for model, keys in DUPLICATE_KEYS.items():
+        groups = (
+            db.session.query(func.count().label("rows"))
+            .select_from(model)
+            .group_by(*[getattr(model, key) for key in keys])
+            .having(func.count() > 1)
+            .subquery()
+        )
+        count, rows = db.session.query(
+            func.count(), func.coalesce(func.sum(groups.c.rows), 0)
+        ).one()
+        report[model.__tablename__] = {
+            "keys": keys,
+            "groups": count,
+            "extra_rows": rows - count,
+        }
+    return report
+
+
+def storage_report():
+    """
+    Report row counts and sizes per table, the database file usage, orphaned
+    images and duplicate rows
+    """
+    connection = db.session.connection()
+    tables = sorted(inspect(connection).get_table_names())
+    report = {"tables": {}}
+
+    for table in tables:
+        count = connection.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar()
+        report["tables"][table] = {"rows": count}
+
+    if _is_sqlite():
+        source, sizes = _table_bytes(connection, tables)
+        report["bytes_source"] = source
+        for table in tables:
+            report["tables"][table].update(sizes.get(table, {}))
+
+        page_size = _pragma(connection, "page_size")
+        report["database"] = {
+            "page_size": page_size,
+            "file_bytes": _pragma(connection, "page_count") * page_size,
+            "free_bytes": _pragma(connection, "freelist_count") * page_size,
+            "auto_vacuum": ["none", "full", "incremental"][
+                _pragma(connection, "auto_vacuum")
+            ],
+            "journal_mode": _pragma(connection, "journal_mode"),
+        }
+
+    count, size = (
+        orphan_images()
+        .with_entities(
+            func.count(Image.id),
+            func.coalesce(func.sum(func.length(Image.base64_data)), 0),
+        )
+        .one()
+    )
+    report["orphan_images"] = {"rows": count, "base64_bytes": size}
+    report["duplicates"] = duplicate_rows()
+    return report
+
+
+def delete_orphan_images(batch_size=ORPHAN_BATCH_SIZE, pause=PAUSE_SECONDS):
+    """
+    Delete orphaned images one short transaction at a time, leaving
+    tombstones for delta sync and pausing between batches so other writers
+    get the lock. Returns the number of rows deleted.
+    """
+    deleted = 0
+    while True:
+        ids = [row_id for (row_id,) in orphan_images().limit(batch_size)]
+        if not ids:
+            return deleted
+        db.session.execute(
+            delete(Image)
+            .where(Image.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        record_tombstones(db.session.connection(), Image.__tablename__, ids)
+        db.session.commit()
+        deleted += len(ids)
+        time.sleep(pause)
+
+
+def _autocommit():
+    # PRAGMAs that change the file and VACUUM can't run inside a transaction
+    return db.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def vacuum(pages=VACUUM_PAGES, pause=PAUSE_SECONDS, enable_incremental=False):
+    """
+    Return free pages to the filesystem a few at a time with incremental
+    vacuum. A database created without auto_vacuum=INCREMENTAL needs one
+    full VACUUM to switch, which locks it for the duration, so that only
+    happens when enable_incremental is set.
+    """
+    if not _is_sqlite():
+        return {"skipped": "only SQLite databases are vacuumed"}
+
+    with _autocommit() as connection:
+        mode = _pragma(connection, "auto_vacuum")
+    if mode != 2:
+        if not enable_incremental:
+            return {
+                "skipped": "auto_vacuum is not incremental; enable it once "
+                "with enable_incremental (a full, blocking VACUUM)"
+            }
+        with _autocommit() as connection:
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+        # Pooled connections keep reporting the old auto_vacuum mode until
+        # they are reopened
+        db.engine.dispose()
+        return {"full_vacuum": True, "pages_freed": None}
+
+    freed = 0
+    with _autocommit() as connection:
+        page_size = _pragma(connection, "page_size")
+        while True:
+            free = _pragma(connection, "freelist_count")
+            if free == 0:
+                break
+            # The pragma frees one page per step and pysqlite only steps a
+            # statement without result columns once, so run it as a script
+            connection.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(pages)})"
+            )
+            step = free - _pragma(connection, "freelist_count")
+            if step == 0:
+                break
+            freed += step
+            time.sleep(pause)
+    return {
+        "full_vacuum": False,
+        "pages_freed": freed,
+        "bytes_freed": freed * page_size,
+    }
+
+
+def analyze():
+    """
+    Refresh the query planner statistics
+    """
+    with _autocommit() as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def compact(
+    orphans=True,
+    batch_size=ORPHAN_BATCH_SIZE,
+    vacuum_pages=VACUUM_PAGES,
+    pause=PAUSE_SECONDS,
+    enable_incremental=False,
+):
+    """
+    Delete orphaned images, refresh planner statistics, then release free
+    pages, each in small steps so reads are never blocked for long
+    """
+    result = {"orphan_images_deleted": 0}
+    if orphans:
+        result["orphan_images_deleted"] = delete_orphan_images(batch_size, pause)
+    analyze()
+    result["analyzed"] = True
+    result["vacuum"] = vacuum(vacuum_pages, pause, enable_incremental)
+    return result
+
+
+storage_cli = AppGroup("storage", help="Inspect and compact the database.")
+
+
+@storage_cli.command("report")
+def report_command():
+    """Report row counts, sizes, orphaned images and duplicate rows."""
+    click.echo(json.dumps(storage_report(), indent=2))
+
+
+@storage_cli.command("compact")
+@click.option("--no-orphans", is_flag=True, help="Keep orphaned images.")
+@click.option("--batch-size", default=ORPHAN_BATCH_SIZE, help="Orphans per delete.")
+@click.option("--vacuum-pages", default=VACUUM_PAGES, help="Pages per vacuum step.")
+@click.option("--pause-ms", default=PAUSE_SECONDS * 1000, help="Pause between steps.")
+@click.option(
+    "--enable-incremental",
+    is_flag=True,
+    help="Switch to incremental auto_vacuum with one full VACUUM if needed.",
+)
+def compact_command(no_orphans, batch_size, vacuum_pages, pause_ms, enable_incremental):
+    """Delete orphaned images, ANALYZE and incrementally vacuum."""
+    result = compact(
+        orphans=not no_orphans,
+        batch_size=batch_size,
+        vacuum_pages=vacuum_pages,
+        pause=pause_ms / 1000,
+        enable_incremental=enable_incremental,
+    )
+    click.echo(json.dumps(result, indent=2))
+
+
+def init_app(app):
+    """
+    Add the `flask storage` commands to app
+    """
+    app.cli.add_command(storage_cli)
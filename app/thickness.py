@@ -0,0 +1,69 @@
+import re
+
+# Coating thickness arrives as free-form text such as "8-12µm", "10 um",
+# "0.02mm" or a bare number (assumed to be µm). These patterns are shared by
+# the scalar and the vectorized parser so both normalize identically.
+MICRO_PATTERN = "[µμ]"
+DASH_PATTERN = r"\s*(?:~|～|–|—|\bto\b)\s*"
+RANGE_PATTERN = r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?"
+UNIT_PATTERN = r"(mm|nm|um|micron)"
+UNIT_SCALE = {"mm": 1000.0, "nm": 0.001}
+
+
+def _normalize(text):
+    text = re.sub(MICRO_PATTERN, "u", text.lower())
+    return re.sub(DASH_PATTERN, "-", text)
+
+
+def parse_thickness(value):
+    """
+    Parse a single thickness value into a (min, max) tuple in µm.
+    Returns (None, None) if no number can be found.
+    """
+    if value is None:
+        return None, None
+    text = _normalize(str(value))
+    numbers = re.search(RANGE_PATTERN, text)
+    if numbers is None:
+        return None, None
+
+    unit = re.search(UNIT_PATTERN, text)
+    scale = UNIT_SCALE.get(unit.group(1), 1.0) if unit else 1.0
+    low = float(numbers.group(1)) * scale
+    high = float(numbers.group(2) or numbers.group(1)) * scale
+    return min(low, high), max(low, high)
+
+
+def parse_thickness_series(values):
+    """
+    Vectorized parse_thickness over a column of values. Returns a DataFrame
+    with thickness_min_um and thickness_max_um columns aligned to the input.
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = pd.Series(values)
+    text = (
+        series.astype("string")
+        .str.lower()
+        .str.replace(MICRO_PATTERN, "u", regex=True)
+        .str.replace(DASH_PATTERN, "-", regex=True)
+    )
+
+    numbers = text.str.extract(RANGE_PATTERN)
+    low = pd.to_numeric(numbers[0], errors="coerce").astype(float)
+    high = pd.to_numeric(numbers[1], errors="coerce").astype(float).fillna(low)
+
+    unit = text.str.extract(UNIT_PATTERN)[0].astype(object)
+    scale = pd.Series(1.0, index=series.index)
+    for name, factor in UNIT_SCALE.items():
+        scale = scale.mask(unit == name, factor)
+
+    low, high = low * scale, high * scale
+    return pd.DataFrame(
+        {
+            "thickness_min_um": np.fmin(low, high),
+            "thickness_max_um": np.fmax(low, high),
+        },
+        index=series.index,
+    )
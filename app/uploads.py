@@ -0,0 +1,228 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+
+# Chunked upload sessions live on disk next to the database, as a metadata
+# file plus a spool file that chunks are appended to. The spool file's size
+# is the authoritative upload offset, so sessions survive restarts. Finalize
+# renames the spool file aside before importing it, so only one caller can.
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    Upload protocol error, carrying the HTTP status code to respond with
+    """
+
+    def __init__(self, message, code=400):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _session_dir(folder):
+    path = os.path.join(folder, "uploads")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _paths(folder, upload_id):
+    if not SESSION_ID_PATTERN.match(upload_id):
+        raise UploadError("Upload not found", 404)
+    base = os.path.join(_session_dir(folder), upload_id)
+    return base + ".json", base + ".part"
+
+
+def _importing_path(spool_path):
+    return spool_path[: -len(".part")] + ".importing"
+
+
+def _serialize(session, spool_path):
+    return {
+        "id": session["id"],
+        "filename": session["filename"],
+        "kind": session["kind"],
+        "size": session["size"],
+        "offset": os.path.getsize(spool_path),
+    }
+
+
+def expire_sessions(folder, max_age):
+    """
+    Delete the files of every session, finished or not, untouched for more
+    than max_age seconds. Returns the number of sessions removed.
+    """
+    path = _session_dir(folder)
+    touched = {}
+    for name in os.listdir(path):
+        upload_id = name.split(".")[0]
+        if not SESSION_ID_PATTERN.match(upload_id):
+            continue
+        try:
+            mtime = os.path.getmtime(os.path.join(path, name))
+        except FileNotFoundError:
+            continue
+        touched[upload_id] = max(touched.get(upload_id, 0), mtime)
+
+    expired = [
+        upload_id
+        for upload_id, mtime in touched.items()
+        if mtime < time.time() - max_age
+    ]
+    for upload_id in expired:
+        delete_session(folder, upload_id)
+    return len(expired)
+
+
+def create_session(folder, filename, kind, size, sha256=None):
+    """
+    Start a new upload session and return its state
+    """
+    upload_id = uuid.uuid4().hex
+    meta_path, spool_path = _paths(folder, upload_id)
+    session = {
+        "id": upload_id,
+        "filename": filename,
+        "kind": kind,
+        "size": size,
+        "sha256": sha256.lower() if sha256 else None,
+    }
+    open(spool_path, "wb").close()
+    with open(meta_path, "w") as file:
+        json.dump(session, file)
+    return _serialize(session, spool_path)
+
+
+def load_session(folder, upload_id):
+    """
+    Load an upload session, raising UploadError if it does not exist
+    """
+    meta_path, spool_path = _paths(folder, upload_id)
+    if os.path.exists(meta_path) and os.path.exists(_importing_path(spool_path)):
+        raise UploadError("Upload is already being finalized", 409)
+    if not os.path.exists(meta_path) or not os.path.exists(spool_path):
+        raise UploadError("Upload not found", 404)
+    with open(meta_path) as file:
+        return json.load(file), spool_path
+
+
+def get_session(folder, upload_id):
+    """
+    Get the state of an upload session, including its current offset
+    """
+    session, spool_path = load_session(folder, upload_id)
+    return _serialize(session, spool_path)
+
+
+def append_chunk(folder, upload_id, content_range, stream, sha256=None):
+    """
+    Append one chunk read from stream to the spool file. The chunk must
+    start at the current offset; if its SHA-256 does not match it is
+    discarded and the offset is left unchanged.
+    """
+    session, spool_path = load_session(folder, upload_id)
+
+    match = CONTENT_RANGE_PATTERN.match(content_range or "")
+    if match is None:
+        raise UploadError("Missing or invalid Content-Range header")
+    start, end, total = match.groups()
+    start, end = int(start), int(end)
+    if total != "*" and int(total) != session["size"]:
+        raise UploadError(
+            f"Content-Range total must be the upload size, {session['size']}", 416
+        )
+    if end < start or end >= session["size"]:
+        raise UploadError("Content-Range is outside the upload", 416)
+
+    with open(spool_path, "r+b") as spool:
+        # Serialize writers to the same session, across threads and workers
+        fcntl.flock(spool, fcntl.LOCK_EX)
+        if not os.path.exists(spool_path):
+            raise UploadError("Upload is already being finalized", 409)
+        offset = spool.seek(0, os.SEEK_END)
+        if start != offset:
+            raise UploadError(f"Chunk must start at offset {offset}", 409)
+
+        digest = hashlib.sha256()
+        remaining = end - start + 1
+        while remaining:
+            block = stream.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            spool.write(block)
+            digest.update(block)
+            remaining -= len(block)
+
+        if remaining:
+            spool.truncate(offset)
+            raise UploadError("Chunk is shorter than its Content-Range")
+        if sha256 and digest.hexdigest() != sha256.lower():
+            spool.truncate(offset)
+            raise UploadError("Chunk checksum mismatch", 422)
+
+    return _serialize(session, spool_path)
+
+
+def finalize_session(folder, upload_id):
+    """
+    Check that an upload is complete and intact, then claim it for import by
+    moving the spool file aside under the session lock, so a retried or
+    concurrent finalize gets a 409. Returns the session and the path of the
+    assembled file.
+    """
+    session, spool_path = load_session(folder, upload_id)
+    importing_path = _importing_path(spool_path)
+
+    try:
+        spool = open(spool_path, "rb")
+    except FileNotFoundError:
+        raise UploadError("Upload is already being finalized", 409)
+    with spool:
+        fcntl.flock(spool, fcntl.LOCK_EX)
+        if not os.path.exists(spool_path):
+            raise UploadError("Upload is already being finalized", 409)
+
+        offset = os.fstat(spool.fileno()).st_size
+        if offset != session["size"]:
+            raise UploadError(
+                f"Upload is incomplete: {offset} of {session['size']} bytes received",
+                409,
+            )
+
+        if session["sha256"]:
+            digest = hashlib.sha256()
+            for block in iter(lambda: spool.read(BLOCK_SIZE), b""):
+                digest.update(block)
+            if digest.hexdigest() != session["sha256"]:
+                raise UploadError("Upload checksum mismatch", 422)
+
+        os.rename(spool_path, importing_path)
+        # Keep a long import from looking abandoned to expire_sessions
+        os.utime(importing_path)
+
+    return session, importing_path
+
+
+def release_session(folder, upload_id):
+    """
+    Hand a claimed upload back after a failed import, so finalize can be
+    retried
+    """
+    _, spool_path = _paths(folder, upload_id)
+    os.rename(_importing_path(spool_path), spool_path)
+
+
+def delete_session(folder, upload_id):
+    """
+    Remove an upload session and its spool file
+    """
+    meta_path, spool_path = _paths(folder, upload_id)
+    for path in (meta_path, spool_path, _importing_path(spool_path)):
+        if os.path.exists(path):
+            os.remove(path)
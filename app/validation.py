@@ -0,0 +1,92 @@
+# Spreadsheet rows as users see them: the header is row 1, data starts on row 2
+FIRST_DATA_ROW = 2
+
+# Columns each import sheet must have (after read_excel normalizes headers),
+# the numeric ones with their allowed (min, max) range, and the column sets
+# that must not repeat within a sheet
+COATING_SHEET = {
+    "required": ["category", "subcategory", "thickness", "color"],
+    "numeric": {},
+    "unique": [("category", "subcategory")],
+}
+MATERIAL_SHEET = {
+    "required": ["grade", "br_t", "hcb_ka/m", "bh_max_kj/m3"],
+    "numeric": {"br_t": (0, None), "hcb_ka/m": (0, None), "bh_max_kj/m3": (0, None)},
+    "unique": [("grade",)],
+}
+
+
+class SheetValidationError(Exception):
+    """
+    An import spreadsheet failed validation; errors is the per-row report
+    """
+
+    def __init__(self, errors, message="Invalid spreadsheet", code=400):
+        super().__init__(message)
+        self.errors = errors
+        self.message = message
+        self.code = code
+
+
+def _row_errors(df, mask, column, error):
+    return [
+        {"row": int(index) + FIRST_DATA_ROW, "column": column, "error": error}
+        for index in df.index[mask]
+    ]
+
+
+def validate_sheet(df, sheet):
+    """
+    Check a whole DataFrame against a sheet spec at once: required columns,
+    missing values, numeric dtypes and ranges, and duplicates. Returns the
+    errors sorted by row, each {"row", "column", "error"}, and converts the
+    numeric columns of df to floats in place so they can be inserted as is.
+    """
+    import pandas as pd
+
+    missing = [column for column in sheet["required"] if column not in df.columns]
+    if missing:
+        return [
+            {"row": None, "column": column, "error": "Missing column"}
+            for column in missing
+        ]
+
+    errors = []
+    blank = {}
+    for column in sheet["required"]:
+        values = df[column]
+        blank[column] = values.isna() | (values.astype(str).str.strip() == "")
+        errors.extend(_row_errors(df, blank[column], column, "Missing value"))
+
+    for column, (low, high) in sheet["numeric"].items():
+        numbers = pd.to_numeric(df[column], errors="coerce").astype(float)
+        invalid = ~blank[column] & numbers.isna()
+        errors.extend(_row_errors(df, invalid, column, "Must be a number"))
+        if low is not None:
+            errors.extend(
+                _row_errors(df, numbers < low, column, f"Must be at least {low}")
+            )
+        if high is not None:
+            errors.extend(
+                _row_errors(df, numbers > high, column, f"Must be at most {high}")
+            )
+        df[column] = numbers
+
+    for columns in sheet["unique"]:
+        present = ~pd.concat([blank[column] for column in columns], axis=1).any(axis=1)
+        rows = df.index.to_series()[present]
+        # The first row of each group of equal keys, for every row in it
+        first = rows.groupby(
+            [df.loc[present, column] for column in columns], sort=False
+        ).transform("first")
+        duplicates = first[first != rows]
+        errors.extend(
+            {
+                "row": int(index) + FIRST_DATA_ROW,
+                "column": columns[-1],
+                "error": f"Duplicate of row {int(row) + FIRST_DATA_ROW}",
+            }
+            for index, row in duplicates.items()
+        )
+
+    return sorted(errors, key=lambda error: (error["row"], error["column"]))
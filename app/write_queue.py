@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from app import db
+
+
+class WriteQueue:
+    """
+    Group commit for small writes: a single writer thread collects the
+    operations submitted by concurrent requests for up to max_delay seconds
+    (or max_batch operations) and commits them in one transaction.
+
+    An operation is a callable that adds objects to db.session, flushes, and
+    returns the response body; it runs on the writer thread. If one operation
+    fails, only its future gets the error and the rest of the batch is retried
+    without it.
+    """
+
+    def __init__(self, app, max_batch, max_delay):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.committed = 0
+        self.failed = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, operation):
+        """
+        Queue an operation and return a Future for its result
+        """
+        future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Skip operations whose request gave up waiting
+        return [item for item in batch if item[1].set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                with self.app.app_context():
+                    self._commit(batch)
+            except Exception as error:
+                self.app.logger.exception("Write queue failed to commit a batch")
+                for _, future in batch:
+                    if not future.done():
+                        self._fail(future, error)
+            with self._lock:
+                self.batches += 1
+
+    def _fail(self, future, error):
+        future.set_exception(error)
+        with self._lock:
+            self.failed += 1
+
+    def _commit(self, batch):
+        while batch:
+            results = []
+            try:
+                for operation, future in batch:
+                    results.append(operation())
+            except Exception as error:
+                db.session.rollback()
+                self._fail(future, error)
+                batch = [item for item in batch if item[1] is not future]
+                continue
+
+            try:
+                db.session.commit()
+            except Exception as error:
+                db.session.rollback()
+                if len(batch) == 1:
+                    self._fail(batch[0][1], error)
+                    return
+                # The failing operation is unknown, so commit each one alone
+                for item in batch:
+                    self._commit([item])
+                return
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self.committed += len(batch)
+            return
+
+    def metrics(self):
+        """
+        Snapshot of the queue depth and commit counters
+        """
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "batches": self.batches,
+                "committed": self.committed,
+                "failed": self.failed,
+                "max_batch": self.max_batch,
+                "max_delay_ms": self.max_delay * 1000,
+            }
+
+
+def commit_write(operation):
+    """
+    Run a write operation and commit it, through the write queue when it is
+    enabled. Returns the operation's result.
+    """
+    write_queue = current_app.extensions.get("write_queue")
+    if write_queue is None:
+        result = operation()
+        db.session.commit()
+        return result
+
+    future = write_queue.submit(operation)
+    try:
+        return future.result(timeout=current_app.config["WRITE_QUEUE_TIMEOUT"])
+    except TimeoutError:
+        if future.cancel():
+            raise ServiceUnavailable("Timed out waiting to write, please retry")
+        # Already being committed, so its outcome is only moments away
+        return future.result()
+
+
+def _service_unavailable(error):
+    # Imported late because the blueprints import this module
+    from app.routes.responses import failure_response
+
+    return failure_response(error.description, 503)
+
+
+def init_app(app):
+    """
+    Start the write queue for app if WRITE_QUEUE_ENABLED is set
+    """
+    if not app.config.get("WRITE_QUEUE_ENABLED"):
+        return
+
+    app.extensions["write_queue"] = WriteQueue(
+        app,
+        app.config.get("WRITE_QUEUE_MAX_BATCH", 64),
+        app.config.get("WRITE_QUEUE_MAX_DELAY_MS", 5) / 1000,
+    )
+    app.register_error_handler(ServiceUnavailable, _service_unavailable)
+
+
+def write_queue_metrics():
+    """
+    Report the state of the current app's write queue, if it has one
+    """
+    write_queue = current_app.extensions.get("write_queue")
+    return write_queue.metrics() if write_queue is not None else None
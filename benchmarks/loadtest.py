@@ -0,0 +1,393 @@
+"""
+Mixed-workload load test
+
+Starts the app from create_app() against a freshly seeded SQLite database,
+serves it with the same threaded Werkzeug server that run.py uses, and
+drives a weighted mix of catalog browsing, shape detail, material queries
+and occasional zip/Excel imports from concurrent clients. Prints per-endpoint
+throughput, latency percentiles and error rates, and writes the same numbers
+as JSON so reports can be diffed between releases.
+
+Usage: python benchmarks/loadtest.py --duration 30 --concurrency 16 \
+           --mix browse=50,shape=20,material=25,import=5 --output report.json
+"""
+
+import argparse
+import base64
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import zipfile
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from werkzeug.serving import make_server
+
+from app import create_app, db
+from app.models import (
+    Coating,
+    CoatingCategory,
+    Image,
+    Material,
+    MaterialCategory,
+    Shape,
+)
+from config import Config
+
+DEFAULT_MIX = "browse=50,shape=20,material=25,import=5"
+
+# A tiny valid PNG for the imported archives
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d00000000"
+    "49454e44ae426082"
+)
+
+
+#### SEEDING ####
+
+
+def seed(args):
+    """
+    Fill an empty database with a catalog of the requested size
+    """
+    rng = random.Random(args.seed)
+    image = base64.b64encode(rng.randbytes(args.image_kb * 768)).decode("utf-8")
+
+    db.create_all()
+    coating_categories = db.session.scalars(
+        insert(CoatingCategory).returning(CoatingCategory.id),
+        [{"name": f"Coating {i}"} for i in range(args.coating_categories)],
+    ).all()
+    db.session.execute(
+        insert(Coating),
+        [
+            {
+                "sub_category": f"Sub {i}",
+                "thickness": f"{rng.randint(5, 20)}-{rng.randint(21, 40)}µm",
+                "color": rng.choice(["Silver", "Black", "Blue", "Gold"]),
+                "category_id": rng.choice(coating_categories),
+            }
+            for i in range(args.coatings)
+        ],
+    )
+    material_categories = db.session.scalars(
+        insert(MaterialCategory).returning(MaterialCategory.id),
+        [
+            {"name": f"Material {i}", "is_rare_earth": i % 2 == 0}
+            for i in range(args.material_categories)
+        ],
+    ).all()
+    db.session.execute(
+        insert(Material),
+        [
+            {
+                "grade": f"N{i}",
+                "br_t": rng.randint(1000, 1500),
+                "hcb_kA_m": rng.randint(700, 1100),
+                "bh_max_kj_m3": rng.randint(200, 450),
+                "category_id": rng.choice(material_categories),
+            }
+            for i in range(args.materials)
+        ],
+    )
+    shapes = db.session.scalars(
+        insert(Shape).returning(Shape.id),
+        [{"name": f"Shape {i}"} for i in range(args.shapes)],
+    ).all()
+    db.session.execute(
+        insert(Image),
+        [
+            {
+                "name": f"shape_{shape_id}_{i}.png",
+                "base64_data": image,
+                "shape_id": shape_id,
+                "category_id": -1,
+            }
+            for shape_id in shapes
+            for i in range(args.images_per_shape)
+        ],
+    )
+    db.session.commit()
+    return {
+        "coating_categories": coating_categories,
+        "material_categories": material_categories,
+        "materials": db.session.scalars(db.select(Material.id)).all(),
+        "shapes": shapes,
+    }
+
+
+#### CLIENT ####
+
+
+class Client:
+    """
+    HTTP client that records (status, latency) samples per endpoint template
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def call(self, method, template, id=None, body=None, headers=None):
+        """
+        Send one request to template (with <id> filled in) and record its
+        status and latency. Connection errors are recorded with status 0.
+        """
+        path = template if id is None else template.replace("<id>", str(id))
+        req = urllib.request.Request(
+            self.base_url + path, data=body, method=method, headers=headers or {}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            status = error.code
+        except OSError:
+            status = 0
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            self.samples[f"{method} {template}"].append((status, latency))
+
+    def get(self, template, id=None):
+        self.call("GET", template, id)
+
+    def upload(self, template, filename, content, content_type):
+        body, headers = multipart(filename, content, content_type)
+        self.call("POST", template, body=body, headers=headers)
+
+
+def multipart(filename, content, content_type):
+    boundary = uuid.uuid4().hex
+    body = (
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def shapes_zip(rng, images):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for shape in range(3):
+            name = f"Imported {uuid.UUID(int=rng.getrandbits(128)).hex[:12]}"
+            for i in range(images):
+                z.writestr(f"shapes/{name}/{i}.png", PNG_BYTES)
+    return buffer.getvalue()
+
+
+def coatings_excel(rng, rows):
+    buffer = io.BytesIO()
+    pd.DataFrame(
+        {
+            "Category": [f"Coating {rng.randint(0, 4)}" for _ in range(rows)],
+            "Sub Category": [f"Imported {i}" for i in range(rows)],
+            "Thickness": [f"{rng.randint(5, 40)}µm" for _ in range(rows)],
+            "Color": [rng.choice(["Silver", "Black"]) for _ in range(rows)],
+        }
+    ).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def scenarios(client, catalog):
+    """
+    The traffic mix: each scenario is one user action, possibly several requests
+    """
+
+    def browse(rng):
+        client.get("/api/coatings/categories")
+        client.get("/api/materials/categories")
+        client.get("/api/shapes/")
+        client.get(
+            "/api/coatings/categories/<id>", rng.choice(catalog["coating_categories"])
+        )
+
+    def shape(rng):
+        client.get("/api/shapes/<id>", rng.choice(catalog["shapes"]))
+
+    def material(rng):
+        client.get("/api/materials/<id>", rng.choice(catalog["materials"]))
+        client.get(
+            "/api/materials/categories/<id>", rng.choice(catalog["material_categories"])
+        )
+        client.get("/api/materials/facets")
+
+    def imports(rng):
+        if rng.random() < 0.5:
+            client.upload(
+                "/api/shapes/upload_zip",
+                "shapes.zip",
+                shapes_zip(rng, 4),
+                "application/zip",
+            )
+        else:
+            client.upload(
+                "/api/coatings/upload_excel",
+                "coatings.xlsx",
+                coatings_excel(rng, 50),
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+    return {"browse": browse, "shape": shape, "material": material, "import": imports}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def run(base_url, catalog, args):
+    """
+    Drive the traffic mix from args.concurrency threads for args.duration seconds
+    """
+    client = Client(base_url)
+    actions = scenarios(client, catalog)
+    mix = parse_mix(args.mix)
+    unknown = set(mix) - set(actions)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + args.duration
+
+    def worker(index):
+        rng = random.Random(args.seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            actions[rng.choices(names, weights)[0]](rng)
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return client, time.perf_counter() - start
+
+
+#### REPORT ####
+
+
+def summarize(samples, elapsed):
+    statuses = np.array([status for status, _ in samples])
+    latencies = np.array([latency for _, latency in samples]) * 1000
+    errors = int(np.sum((statuses == 0) | (statuses >= 500)))
+    rejected = int(np.sum(statuses == 429))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+        "rejected": rejected,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(latencies.max()), 2),
+    }
+
+
+def build_report(client, elapsed, args):
+    every = [sample for samples in client.samples.values() for sample in samples]
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "elapsed_s": round(elapsed, 2),
+        "total": summarize(every, elapsed) if every else None,
+        "endpoints": {
+            endpoint: summarize(samples, elapsed)
+            for endpoint, samples in sorted(client.samples.items())
+        },
+    }
+
+
+def print_report(report):
+    header = f"{'endpoint':44} {'reqs':>7} {'rps':>8} {'err%':>6} {'429':>5} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for endpoint, stats in rows:
+        if stats is None:
+            continue
+        print(
+            f"{endpoint:44} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} "
+            f"{stats['error_rate'] * 100:>6.2f} {stats['rejected']:>5} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,...")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--coating-categories", type=int, default=5)
+    parser.add_argument("--coatings", type=int, default=500)
+    parser.add_argument("--material-categories", type=int, default=10)
+    parser.add_argument("--materials", type=int, default=2000)
+    parser.add_argument("--shapes", type=int, default=50)
+    parser.add_argument("--images-per-shape", type=int, default=4)
+    parser.add_argument(
+        "--image-kb", type=int, default=20, help="size of seeded images"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="resr-loadtest-")
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(data_dir, "app.db")
+        UPLOAD_FOLDER = data_dir
+
+    try:
+        app = create_app(LoadTestConfig)
+        with app.app_context():
+            catalog = seed(args)
+
+        # Keep the per-request access log out of the report
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        client, elapsed = run(base_url, catalog, args)
+        server.shutdown()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = build_report(client, elapsed, args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
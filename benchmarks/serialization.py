@@ -0,0 +1,137 @@
+"""
+JSON vs MessagePack response encoding
+
+Compares payload size (raw and gzipped) and encode/decode time of the list
+responses the API produces, for JSON and MessagePack, in both the default
+row layout (an array of objects) and the columnar layout (?layout=columnar).
+
+Usage: python benchmarks/serialization.py --rows 20000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import timeit
+
+import msgpack
+
+COATING_COLUMNS = [
+    "id",
+    "main_category",
+    "sub_category",
+    "thickness",
+    "thickness_min_um",
+    "thickness_max_um",
+    "color",
+]
+MATERIAL_COLUMNS = ["id", "grade", "br_t", "hcb_kA_m", "bh_max_kj_m3"]
+
+
+def coating_rows(rng, count):
+    rows = []
+    for i in range(count):
+        low = rng.randint(5, 20)
+        high = rng.randint(21, 40)
+        rows.append(
+            (
+                i + 1,
+                f"Coating {rng.randint(0, 9)}",
+                f"Sub {i}",
+                f"{low}-{high}µm",
+                float(low),
+                float(high),
+                rng.choice(["Silver", "Black", "Blue", "Gold"]),
+            )
+        )
+    return rows
+
+
+def material_rows(rng, count):
+    return [
+        (
+            i + 1,
+            f"N{i}",
+            rng.randint(1000, 1500),
+            rng.randint(700, 1100),
+            rng.randint(200, 450),
+        )
+        for i in range(count)
+    ]
+
+
+def layouts(rows, columns):
+    """
+    The two response bodies rows_response can build from the same rows
+    """
+    return {
+        "rows": [dict(zip(columns, row)) for row in rows],
+        "columnar": {name: [row[i] for row in rows] for i, name in enumerate(columns)},
+    }
+
+
+# Encoders and decoders as the API and a client would use them
+FORMATS = {
+    "json": (
+        lambda body: json.dumps(body, separators=(",", ":")).encode("utf-8"),
+        json.loads,
+    ),
+    "msgpack": (msgpack.packb, msgpack.unpackb),
+}
+
+
+def measure(body, encode, decode, repeat):
+    payload = encode(body)
+    encode_ms = min(timeit.repeat(lambda: encode(body), number=1, repeat=repeat)) * 1000
+    decode_ms = (
+        min(timeit.repeat(lambda: decode(payload), number=1, repeat=repeat)) * 1000
+    )
+    return {
+        "bytes": len(payload),
+        "gzip_bytes": len(gzip.compress(payload)),
+        "encode_ms": round(encode_ms, 3),
+        "decode_ms": round(decode_ms, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="rows per list")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    datasets = {
+        "coatings": layouts(coating_rows(rng, args.rows), COATING_COLUMNS),
+        "materials": layouts(material_rows(rng, args.rows), MATERIAL_COLUMNS),
+    }
+
+    results = []
+    for dataset, bodies in datasets.items():
+        for layout, body in bodies.items():
+            for name, (encode, decode) in FORMATS.items():
+                result = measure(body, encode, decode, args.repeat)
+                results.append(
+                    {"dataset": dataset, "layout": layout, "format": name, **result}
+                )
+
+    print(
+        f"{'dataset':10} {'layout':9} {'format':8} {'bytes':>10} {'gzip':>9} "
+        f"{'encode ms':>10} {'decode ms':>10}"
+    )
+    for result in results:
+        print(
+            f"{result['dataset']:10} {result['layout']:9} {result['format']:8} "
+            f"{result['bytes']:>10} {result['gzip_bytes']:>9} "
+            f"{result['encode_ms']:>10.2f} {result['decode_ms']:>10.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Cold start budget for create_app()
+
+Starts fresh interpreters that import the app and call create_app() against
+an empty SQLite database, the way a worker boot or `flask db upgrade` does.
+Reports the median wall time and peak RSS, plus the slowest packages from one
+extra `python -X importtime` run (which is itself too slow to time). Exits
+non-zero if the median is over the time or memory budget, or if any of the
+heavy ingestion libraries got imported at startup.
+
+Usage: python benchmarks/startup.py --runs 5 --max-ms 1000 --max-rss-mb 80
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the upload, facet and image search code paths may import these
+LAZY_MODULES = ["pandas", "numpy", "openpyxl", "xlrd", "PIL", "msgpack"]
+
+# Runs in the child interpreter and prints one JSON line on stdout
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import config
+config.Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + {database!r}
+config.Config.UPLOAD_FOLDER = {folder!r}
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": sorted({{name.split(".")[0] for name in sys.modules}}),
+}}))
+"""
+
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+\d+ \| *(\S+)")
+
+
+def run_once(folder, importtime=False):
+    """
+    Start the app in a fresh interpreter, returning its measurements and,
+    with importtime, the import time of each top-level package
+    """
+    code = CHILD.format(
+        root=ROOT, database=os.path.join(folder, "app.db"), folder=folder
+    )
+    options = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # Charge each module's own import time to its top-level package
+    imports = {}
+    for match in IMPORTTIME.finditer(result.stderr):
+        top = match[2].split(".")[0]
+        imports[top] = imports.get(top, 0) + int(match[1]) / 1000
+    measurement["imports"] = imports
+    return measurement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreter starts")
+    parser.add_argument("--max-ms", type=float, default=1000, help="time budget")
+    parser.add_argument("--max-rss-mb", type=float, default=80, help="memory budget")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports shown")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = [run_once(folder) for _ in range(args.runs)]
+        imports = run_once(folder, importtime=True)["imports"]
+
+    ms = statistics.median(run["ms"] for run in runs)
+    rss_mb = statistics.median(run["rss_mb"] for run in runs)
+    loaded = sorted(set(LAZY_MODULES) & set(runs[0]["modules"]))
+
+    print(f"create_app()  {ms:8.1f} ms  (budget {args.max_ms:.0f} ms)")
+    print(f"peak RSS      {rss_mb:8.1f} MB  (budget {args.max_rss_mb:.0f} MB)")
+    print(f"lazy modules loaded at startup: {', '.join(loaded) or 'none'}")
+    print()
+    print(f"{'package':30} {'self ms':>14}")
+    for name, self_ms in sorted(imports.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:30} {self_ms:>14.1f}")
+
+    failures = []
+    if ms > args.max_ms:
+        failures.append(f"create_app() took {ms:.1f} ms, over {args.max_ms:.0f} ms")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {rss_mb:.1f} MB, over {args.max_rss_mb:.0f} MB")
+    if loaded:
+        failures.append(f"imported at startup: {', '.join(loaded)}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "ms": ms,
+                    "rss_mb": rss_mb,
+                    "imports": imports,
+                    "lazy_modules_loaded": loaded,
+                    "failures": failures,
+                },
+                file,
+                indent=2,
+            )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
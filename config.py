@@ -5,4 +5,32 @@ basedir = os.path.abspath(os.path.dirname(__file__))  # Get the absolute path of
 class Config(object):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'data', 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    UPLOAD_FOLDER = os.path.join(basedir, 'data')
\ No newline at end of file
+    UPLOAD_FOLDER = os.path.join(basedir, 'data')
+
+    # Optional read engine: a replica URL, or a read-only WAL pool on the SQLite file
+    SQLALCHEMY_READ_DATABASE_URI = os.environ.get('READ_DATABASE_URL')
+    SQLITE_READ_POOL = os.environ.get('SQLITE_READ_POOL', '0') == '1'
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', '5'))
+
+    # Admission control: concurrent requests per endpoint class, plus a bounded wait queue
+    ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', '1') == '1'
+    ADMISSION_LIMITS = {
+        'import': int(os.environ.get('ADMISSION_IMPORT_CONCURRENCY', '2')),
+        'write': int(os.environ.get('ADMISSION_WRITE_CONCURRENCY', '8')),
+        'read': int(os.environ.get('ADMISSION_READ_CONCURRENCY', '32')),
+    }
+    ADMISSION_QUEUE_LIMIT = int(os.environ.get('ADMISSION_QUEUE_LIMIT', '16'))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', '5'))
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_UPLOAD_MB', '512')) * 1024 * 1024
+
+    # Chunked upload sessions left untouched this long are deleted when a new one starts
+    UPLOAD_SESSION_TTL_HOURS = float(os.environ.get('UPLOAD_SESSION_TTL_HOURS', '24'))
+
+    # Group commit: batch small concurrent writes into one transaction every few ms
+    WRITE_QUEUE_ENABLED = os.environ.get('WRITE_QUEUE_ENABLED', '0') == '1'
+    WRITE_QUEUE_MAX_BATCH = int(os.environ.get('WRITE_QUEUE_MAX_BATCH', '64'))
+    WRITE_QUEUE_MAX_DELAY_MS = float(os.environ.get('WRITE_QUEUE_MAX_DELAY_MS', '5'))
+    WRITE_QUEUE_TIMEOUT = float(os.environ.get('WRITE_QUEUE_TIMEOUT', '10'))
+
+    # Admin endpoints (storage report and compaction) are disabled unless a token is set
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
@@ -0,0 +1,82 @@
+"""add numeric coating thickness columns
+
+Revision ID: 5b8e1f0c7a21
+Revises: 2ce7d59b9099
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.thickness import parse_thickness_series
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e1f0c7a21'
+down_revision = '2ce7d59b9099'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+coating = sa.table(
+    'coating',
+    sa.column('id', sa.Integer),
+    sa.column('thickness', sa.String),
+    sa.column('thickness_min_um', sa.Float),
+    sa.column('thickness_max_um', sa.Float),
+)
+
+
+def _none_if_nan(value):
+    return None if value != value else float(value)
+
+
+def upgrade():
+    op.add_column('coating', sa.Column('thickness_min_um', sa.Float(), nullable=True))
+    op.add_column('coating', sa.Column('thickness_max_um', sa.Float(), nullable=True))
+
+    # Backfill from the free-form strings in id-ordered batches
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(coating.c.id, coating.c.thickness)
+            .where(coating.c.id > last_id)
+            .order_by(coating.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        parsed = parse_thickness_series([thickness for _, thickness in rows])
+        bind.execute(
+            coating.update()
+            .where(coating.c.id == sa.bindparam('row_id'))
+            .values(
+                thickness_min_um=sa.bindparam('min_um'),
+                thickness_max_um=sa.bindparam('max_um'),
+            ),
+            [
+                {
+                    'row_id': row_id,
+                    'min_um': _none_if_nan(min_um),
+                    'max_um': _none_if_nan(max_um),
+                }
+                for (row_id, _), min_um, max_um in zip(
+                    rows, parsed['thickness_min_um'], parsed['thickness_max_um']
+                )
+            ],
+        )
+        last_id = rows[-1][0]
+
+    op.create_index(op.f('ix_coating_thickness_min_um'), 'coating', ['thickness_min_um'], unique=False)
+    op.create_index(op.f('ix_coating_thickness_max_um'), 'coating', ['thickness_max_um'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_coating_thickness_max_um'), table_name='coating')
+    op.drop_index(op.f('ix_coating_thickness_min_um'), table_name='coating')
+    with op.batch_alter_table('coating') as batch_op:
+        batch_op.drop_column('thickness_max_um')
+        batch_op.drop_column('thickness_min_um')
@@ -0,0 +1,102 @@
+"""add catalog change tracking
+
+Revision ID: 9d4a6c3e2f18
+Revises: 5b8e1f0c7a21
+Create Date: 2026-10-19 10:02:17.552908
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a6c3e2f18'
+down_revision = '5b8e1f0c7a21'
+branch_labels = None
+depends_on = None
+
+CATALOG_TABLES = [
+    'coating_category',
+    'coating',
+    'shape',
+    'image',
+    'material_category',
+    'material',
+]
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.create_table('change_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('tombstone',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tombstone_change_seq'), 'tombstone', ['change_seq'], unique=False)
+
+    for table_name in CATALOG_TABLES:
+        op.add_column(table_name, sa.Column('updated_at', sa.DateTime(), nullable=False, server_default='1970-01-01 00:00:00'))
+        op.add_column(table_name, sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'))
+
+    # SQLite can't add a NOT NULL column with a non-constant default, so
+    # updated_at starts at the epoch and is set to now during the backfill.
+    # Every existing row gets its own sequence number, table by table in
+    # id-ordered batches, and the counter is left at the last one handed out
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    seq = 0
+    for table_name in CATALOG_TABLES:
+        table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('updated_at', sa.DateTime), sa.column('change_seq', sa.Integer))
+        last_id = 0
+        while True:
+            ids = bind.execute(
+                sa.select(table.c.id)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(BATCH_SIZE)
+            ).scalars().all()
+            if not ids:
+                break
+            bind.execute(
+                table.update()
+                .where(table.c.id == sa.bindparam('row_id'))
+                .values(updated_at=now, change_seq=sa.bindparam('seq')),
+                [{'row_id': row_id, 'seq': seq + i + 1} for i, row_id in enumerate(ids)],
+            )
+            seq += len(ids)
+            last_id = ids[-1]
+
+        # The defaults only existed to add the columns; the models stamp
+        # every row, so leave no default for writes that bypass them
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), existing_nullable=False, server_default=None)
+            batch_op.alter_column('change_seq', existing_type=sa.Integer(), existing_nullable=False, server_default=None)
+
+        op.create_index(op.f(f'ix_{table_name}_updated_at'), table_name, ['updated_at'], unique=False)
+        op.create_index(op.f(f'ix_{table_name}_change_seq'), table_name, ['change_seq'], unique=False)
+
+    change_counter = sa.table('change_counter', sa.column('id', sa.Integer), sa.column('value', sa.Integer))
+    bind.execute(change_counter.insert().values(id=1, value=seq))
+
+
+def downgrade():
+    for table_name in reversed(CATALOG_TABLES):
+        op.drop_index(op.f(f'ix_{table_name}_change_seq'), table_name=table_name)
+        op.drop_index(op.f(f'ix_{table_name}_updated_at'), table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('change_seq')
+            batch_op.drop_column('updated_at')
+
+    op.drop_index(op.f('ix_tombstone_change_seq'), table_name='tombstone')
+    op.drop_table('tombstone')
+    op.drop_table('change_counter')
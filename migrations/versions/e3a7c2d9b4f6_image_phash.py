@@ -0,0 +1,64 @@
+"""add perceptual hash to image
+
+Revision ID: e3a7c2d9b4f6
+Revises: 9d4a6c3e2f18
+Create Date: 2026-10-19 11:40:03.218476
+
+"""
+import base64
+import binascii
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.image_index import compute_phash, to_signed
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c2d9b4f6'
+down_revision = '9d4a6c3e2f18'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+
+def upgrade():
+    with op.batch_alter_table('image', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phash', sa.BigInteger(), nullable=True))
+
+    # Hash the existing images in id-ordered batches so the base64 payloads
+    # never all sit in memory at once
+    bind = op.get_bind()
+    image = sa.table('image', sa.column('id', sa.Integer), sa.column('base64_data', sa.String), sa.column('phash', sa.BigInteger))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(image.c.id, image.c.base64_data)
+            .where(image.c.id > last_id)
+            .order_by(image.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row_id, base64_data in rows:
+            try:
+                phash = compute_phash(base64.b64decode(base64_data))
+            except (binascii.Error, ValueError):
+                phash = None
+            if phash is not None:
+                updates.append({'row_id': row_id, 'phash': to_signed(phash)})
+        if updates:
+            bind.execute(
+                image.update()
+                .where(image.c.id == sa.bindparam('row_id'))
+                .values(phash=sa.bindparam('phash')),
+                updates,
+            )
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    with op.batch_alter_table('image', schema=None) as batch_op:
+        batch_op.drop_column('phash')